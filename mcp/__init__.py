@@ -1 +0,0 @@
-# MCP package for Okra credit agent
@@ -2,37 +2,68 @@
 FastAPI service for Okra credit quotes.
 """
 
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from decimal import Decimal
-from typing import Any, Dict, Optional
+from typing import Annotated, Any, AsyncIterator, Dict, List, Optional, Tuple
 
-from fastapi import FastAPI, HTTPException, Query, status
-from pydantic import BaseModel, Field
+import orjson
+from fastapi import Depends, FastAPI, HTTPException, Query, Response, status
+from fastapi.middleware.gzip import GZipMiddleware
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 from .policies import CreditPolicies, CreditRequest, CreditProfile
 from .events import emit_credit_quote_event
-from .bnpl import score_bnpl, generate_bnpl_quote, validate_features
-from .ce import emit_bnpl_quote_ce, create_bnpl_quote_payload, get_trace_id
-import sys
-import os
+from .ids import derive_quote_id
+from .bnpl import compute_bnpl_response
+from .ce import (
+    emit_bnpl_quote_ce,
+    emit_bnpl_quote_ce_batch,
+    create_bnpl_quote_payload,
+    get_event_time,
+    get_trace_id,
+)
+from .responses import ORJSONResponse, PrerenderedJSONResponse
+from .validation import json_body, json_body_openapi
+from .mcp.router import router as mcp_router
+
+logger = logging.getLogger(__name__)
+
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
-from mcp.server import router as mcp_router
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Let in-flight event emissions finish before shutdown."""
+    yield
+    if app.state.pending_events:
+        await asyncio.gather(*app.state.pending_events, return_exceptions=True)
 
 
 app = FastAPI(
     title="Okra Credit Agent",
     description="Open Credit Agent providing credit quotes and policy evaluation",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
+# Compress larger JSON bodies (quotes with CloudEvents, batches); GZipMiddleware
+# is pure ASGI, so it adds no per-request BaseHTTPMiddleware task overhead
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=6)
+
 # Include MCP router
 app.include_router(mcp_router)
 
+# In-flight event emission tasks, held so they are not garbage collected
+app.state.pending_events = set()
+
 
 # Pydantic models for API
 class AP2Mandate(BaseModel):
     """AP2-aligned mandate for credit requests."""
 
+    model_config = ConfigDict(frozen=True)
+
     actor: Dict[str, Any] = Field(..., description="Actor information")
     cart: Dict[str, Any] = Field(..., description="Cart/transaction information")
     payment: Dict[str, Any] = Field(..., description="Payment context")
@@ -41,6 +72,9 @@ class AP2Mandate(BaseModel):
 class CreditQuoteRequest(BaseModel):
     """Credit quote request."""
 
+    # Read-only after validation: the handler and the event task share it
+    model_config = ConfigDict(frozen=True)
+
     mandate: AP2Mandate = Field(..., description="AP2-aligned mandate")
     credit_profile: Optional[Dict[str, Any]] = Field(None, description="Credit profile information")
     requested_amount: float = Field(..., ge=1000, le=50000, description="Requested credit amount")
@@ -65,6 +99,8 @@ class CreditQuoteResponse(BaseModel):
 class BNPLQuoteRequest(BaseModel):
     """BNPL quote request."""
 
+    model_config = ConfigDict(frozen=True)
+
     amount: float = Field(..., ge=100, le=5000, description="Requested BNPL amount")
     tenor: int = Field(..., ge=1, le=12, description="Payment term in months")
     on_time_rate: float = Field(0.0, ge=0.0, le=1.0, description="Historical on-time payment rate")
@@ -84,36 +120,67 @@ class BNPLQuoteResponse(BaseModel):
     components: Dict[str, float] = Field(..., description="Score components")
 
 
-@app.get("/", response_model=Dict[str, Any])
-async def root():
-    """Root endpoint with API information."""
-    return {
+# Module-level adapter validates raw profile dicts without **kwargs re-packing
+_CREDIT_PROFILE_ADAPTER = TypeAdapter(CreditProfile)
+
+
+def _on_event_emitted(task: "asyncio.Task[Any]") -> None:
+    """Release a finished event task and report emission failures."""
+    app.state.pending_events.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        # Don't fail the request if event emission fails
+        logger.warning("Failed to emit credit quote event: %s", task.exception())
+
+
+# Static endpoint bodies, serialized once at import time
+_ROOT_BYTES = orjson.dumps(
+    {
         "service": "Okra Credit Agent",
         "version": "0.1.0",
         "status": "operational",
         "endpoints": {
             "credit_quote": "/credit/quote",
             "bnpl_quote": "/bnpl/quote",
+            "bnpl_quote_batch": "/bnpl/quote/batch",
             "policies": "/policies",
             "health": "/health",
         },
     }
+)
+_HEALTH_BYTES = orjson.dumps({"status": "healthy", "service": "okra-credit-agent"})
+
+# Serialize the listing for the shipped policy version at import time, so the
+# first /policies request is served from the cache too
+CreditPolicies.list_policies_json()
+
+
+@app.get("/", response_model=Dict[str, Any])
+async def root() -> Response:
+    """Root endpoint with API information."""
+    return PrerenderedJSONResponse(_ROOT_BYTES)
 
 
 @app.get("/health", response_model=Dict[str, str])
-async def health_check():
+async def health_check() -> Response:
     """Health check endpoint."""
-    return {"status": "healthy", "service": "okra-credit-agent"}
+    return PrerenderedJSONResponse(_HEALTH_BYTES)
 
 
 @app.get("/policies", response_model=Dict[str, Any])
-async def get_policies():
+async def get_policies() -> Response:
     """Get current credit policies and parameters."""
-    return CreditPolicies.list_policies()
+    return PrerenderedJSONResponse(CreditPolicies.list_policies_json())
 
 
-@app.post("/credit/quote", response_model=CreditQuoteResponse, status_code=status.HTTP_200_OK)
-async def get_credit_quote(request: CreditQuoteRequest):
+@app.post(
+    "/credit/quote",
+    status_code=status.HTTP_200_OK,
+    responses={200: {"model": CreditQuoteResponse}},
+    openapi_extra=json_body_openapi(CreditQuoteRequest),
+)
+async def get_credit_quote(
+    request: CreditQuoteRequest = Depends(json_body(CreditQuoteRequest)),
+) -> ORJSONResponse:
     """
     Get a credit quote based on AP2 mandate and credit profile.
 
@@ -131,13 +198,13 @@ async def get_credit_quote(request: CreditQuoteRequest):
         credit_profile = None
         if request.credit_profile:
             try:
-                credit_profile = CreditProfile(**request.credit_profile)
+                credit_profile = _CREDIT_PROFILE_ADAPTER.validate_python(request.credit_profile)
             except Exception:
                 # If profile data is invalid, continue without it
                 credit_profile = None
 
-        # Create credit request
-        credit_request = CreditRequest(
+        # Create credit request (fields were already validated by CreditQuoteRequest)
+        credit_request = CreditRequest.model_construct(
             amount=Decimal(str(request.requested_amount)),
             term_months=request.term_months,
             purpose=request.purpose,
@@ -148,32 +215,38 @@ async def get_credit_quote(request: CreditQuoteRequest):
         # Evaluate using policies
         quote = CreditPolicies.evaluate_credit_request(credit_request)
 
-        # Generate quote ID (in production, this would be a proper UUID)
-        quote_id = f"quote_{actor_id}_{hash(str(credit_request))}"
-
-        # Create response
-        response = CreditQuoteResponse(
-            quote_id=quote_id,
-            approved=quote.approved,
-            credit_limit=float(quote.credit_limit),
-            apr=float(quote.apr),
-            term_months=quote.term_months,
-            monthly_payment=float(quote.monthly_payment),
-            reasons=quote.reasons,
-            review_required=quote.review_required,
-            policy_version=quote.policy_version,
+        # Generate quote ID (stable across processes, unlike the builtin hash)
+        quote_id = derive_quote_id(
+            actor_id,
+            str(request.requested_amount),
+            request.term_months,
+            request.purpose,
+            request.credit_profile,
         )
 
-        # Emit CloudEvent for the quote (optional)
-        try:
-            await emit_credit_quote_event(
+        # Create response dictionary (values come from a validated quote)
+        response_dict = {
+            "quote_id": quote_id,
+            "approved": quote.approved,
+            "credit_limit": float(quote.credit_limit),
+            "apr": float(quote.apr),
+            "term_months": quote.term_months,
+            "monthly_payment": float(quote.monthly_payment),
+            "reasons": quote.reasons,
+            "review_required": quote.review_required,
+            "policy_version": quote.policy_version,
+        }
+
+        # Emit CloudEvent for the quote (optional) without delaying the response
+        task = asyncio.create_task(
+            emit_credit_quote_event(
                 quote_id=quote_id, actor_id=actor_id, mandate=request.mandate, quote=quote
             )
-        except Exception as e:
-            # Don't fail the request if event emission fails
-            print(f"Warning: Failed to emit credit quote event: {e}")
+        )
+        app.state.pending_events.add(task)
+        task.add_done_callback(_on_event_emitted)
 
-        return response
+        return ORJSONResponse(response_dict)
 
     except Exception as e:
         raise HTTPException(
@@ -182,11 +255,48 @@ async def get_credit_quote(request: CreditQuoteRequest):
         )
 
 
-@app.post("/bnpl/quote")
+# Quote fields carried in BNPL CloudEvent payloads, in response order
+_BNPL_QUOTE_FIELDS = ("limit", "apr", "term_months", "monthly_payment", "score", "approved")
+
+
+def _bnpl_quote_result(request: BNPLQuoteRequest) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Score a BNPL request and build its response body.
+
+    Returns:
+        Tuple of (response dictionary, validated features)
+    """
+    # BNPLQuoteRequest already enforces the feature ranges validate_features
+    # clamps to, so the validated fields are used as-is
+    features = {
+        "amount": request.amount,
+        "tenor": request.tenor,
+        "on_time_rate": request.on_time_rate,
+        "utilization": request.utilization,
+    }
+    response_dict = compute_bnpl_response(
+        request.amount, request.tenor, request.on_time_rate, request.utilization
+    )
+    return response_dict, features
+
+
+def _bnpl_quote_payload(
+    response_dict: Dict[str, Any], features: Dict[str, Any], now: str
+) -> Dict[str, Any]:
+    """Build the CloudEvent payload for a BNPL response, timestamped ``now``."""
+    quote = {field: response_dict[field] for field in _BNPL_QUOTE_FIELDS}
+    return create_bnpl_quote_payload(quote, features, response_dict["key_signals"], now=now)
+
+
+@app.post(
+    "/bnpl/quote",
+    responses={200: {"model": BNPLQuoteResponse}},
+    openapi_extra=json_body_openapi(BNPLQuoteRequest),
+)
 async def get_bnpl_quote(
-    request: BNPLQuoteRequest,
+    request: BNPLQuoteRequest = Depends(json_body(BNPLQuoteRequest)),
     emit_ce: bool = Query(False, description="Emit CloudEvent for BNPL quote"),
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """
     Get a BNPL (Buy Now, Pay Later) quote with deterministic scoring.
 
@@ -198,41 +308,21 @@ async def get_bnpl_quote(
         BNPL quote with limit, APR, term, and risk score
     """
     try:
-        # Validate and normalize features
-        features = validate_features(request.model_dump())
-
-        # Score BNPL application
-        scoring_result = score_bnpl(features, random_state=42)
-
-        # Generate BNPL quote
-        quote = generate_bnpl_quote(
-            score=scoring_result["score"], amount=features["amount"], tenor=features["tenor"]
-        )
-
-        # Create response dictionary
-        response_dict = {
-            "limit": quote["limit"],
-            "apr": quote["apr"],
-            "term_months": quote["term_months"],
-            "monthly_payment": quote["monthly_payment"],
-            "score": quote["score"],
-            "approved": quote["approved"],
-            "key_signals": scoring_result["key_signals"],
-            "components": scoring_result["components"],
-        }
+        response_dict, features = _bnpl_quote_result(request)
 
         # Emit CloudEvent if requested
         if emit_ce:
             trace_id = get_trace_id()
-            payload = create_bnpl_quote_payload(quote, features, scoring_result["key_signals"])
-            ce_event = emit_bnpl_quote_ce(trace_id, payload)
+            now = get_event_time()
+            payload = _bnpl_quote_payload(response_dict, features, now)
+            ce_event = emit_bnpl_quote_ce(trace_id, payload, now=now)
 
             # Add CloudEvent to response (for testing purposes)
             # In production, this would be emitted to an event bus
             response_dict["cloud_event"] = ce_event
             response_dict["trace_id"] = trace_id
 
-        return response_dict
+        return ORJSONResponse(response_dict)
 
     except Exception as e:
         raise HTTPException(
@@ -241,7 +331,62 @@ async def get_bnpl_quote(
         )
 
 
-@app.get("/credit/quote/{quote_id}", response_model=CreditQuoteResponse)
+# Largest number of BNPL requests accepted in one batch call
+BNPL_BATCH_MAX_SIZE = 100
+
+BNPLQuoteBatchRequest = Annotated[
+    List[BNPLQuoteRequest], Field(min_length=1, max_length=BNPL_BATCH_MAX_SIZE)
+]
+
+
+@app.post(
+    "/bnpl/quote/batch",
+    responses={200: {"model": List[BNPLQuoteResponse]}},
+    openapi_extra=json_body_openapi(BNPLQuoteBatchRequest),
+)
+async def get_bnpl_quote_batch(
+    requests: List[BNPLQuoteRequest] = Depends(json_body(BNPLQuoteBatchRequest)),
+    emit_ce: bool = Query(False, description="Emit CloudEvents for the BNPL quotes"),
+) -> ORJSONResponse:
+    """
+    Get BNPL quotes for a batch of requests in one call.
+
+    Args:
+        requests: BNPL quote requests, scored independently
+        emit_ce: Whether to emit CloudEvents for the quotes (as one batch)
+
+    Returns:
+        List of BNPL quotes, in request order, shaped like /bnpl/quote responses
+    """
+    try:
+        results = [_bnpl_quote_result(request) for request in requests]
+        responses = [response_dict for response_dict, _ in results]
+
+        # Emit CloudEvents for the whole batch if requested
+        if emit_ce:
+            now = get_event_time()
+            trace_ids = [get_trace_id() for _ in results]
+            ce_events = emit_bnpl_quote_ce_batch(
+                [
+                    (trace_id, _bnpl_quote_payload(response_dict, features, now))
+                    for trace_id, (response_dict, features) in zip(trace_ids, results)
+                ],
+                now=now,
+            )
+            for response_dict, trace_id, ce_event in zip(responses, trace_ids, ce_events):
+                response_dict["cloud_event"] = ce_event
+                response_dict["trace_id"] = trace_id
+
+        return ORJSONResponse(responses)
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error processing BNPL quote batch request: {str(e)}",
+        )
+
+
+@app.get("/credit/quote/{quote_id}", responses={200: {"model": CreditQuoteResponse}})
 async def get_quote_by_id(quote_id: str):
     """
     Retrieve a credit quote by ID (stub implementation).
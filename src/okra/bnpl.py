@@ -4,8 +4,10 @@ Okra BNPL (Buy Now, Pay Later) scoring module.
 Provides deterministic scoring for BNPL credit decisions.
 """
 
-import random
-from typing import Any, Dict
+import math
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Sequence, Tuple, Union
 
 # BNPL configuration constants
 MIN_AMOUNT = 100.0
@@ -28,54 +30,43 @@ def score_bnpl(features: Dict[str, Any], *, random_state: int = 42) -> Dict[str,
 
     Args:
         features: BNPL features containing amount, tenor, on_time_rate, utilization
-        random_state: Random seed for deterministic scoring (default: 42)
+        random_state: Accepted for API compatibility; scoring is fully deterministic
+            and does not use a random number generator
 
     Returns:
         Dictionary with score and key_signals
     """
-    # Set random seed for deterministic results
-    random.seed(random_state)
+    return _score_features(
+        float(features.get("amount", 0.0)),
+        int(features.get("tenor", 1)),
+        float(features.get("on_time_rate", 0.0)),
+        float(features.get("utilization", 0.0)),
+    )
 
-    # Extract and validate features
-    amount = float(features.get("amount", 0.0))
-    tenor = int(features.get("tenor", 1))
-    on_time_rate = float(features.get("on_time_rate", 0.0))
-    utilization = float(features.get("utilization", 0.0))
 
-    # Validate feature ranges
+def _score_features(
+    amount: float, tenor: int, on_time_rate: float, utilization: float
+) -> Dict[str, Any]:
+    """Score one application from already-extracted feature values."""
+    # Validate feature ranges; the clamped values are the cache key as-is, since
+    # any rounding here could move a value across a signal band edge
     amount = max(MIN_AMOUNT, min(MAX_AMOUNT, amount))
     tenor = max(MIN_TENOR, min(MAX_TENOR, tenor))
     on_time_rate = max(0.0, min(1.0, on_time_rate))
     utilization = max(0.0, min(1.0, utilization))
 
-    # Calculate individual component scores
-    amount_score = _calculate_amount_score(amount)
-    tenor_score = _calculate_tenor_score(tenor)
-    on_time_score = on_time_rate  # Direct mapping
-    utilization_score = 1.0 - utilization  # Lower utilization is better
-
-    # Weighted total score
-    total_score = (
-        amount_score * AMOUNT_WEIGHT
-        + tenor_score * TENOR_WEIGHT
-        + on_time_score * ON_TIME_RATE_WEIGHT
-        + utilization_score * UTILIZATION_WEIGHT
-    )
-
-    # Ensure score is bounded
-    total_score = max(MIN_SCORE, min(MAX_SCORE, total_score))
-
-    # Generate key signals
-    key_signals = _generate_key_signals(amount, tenor, on_time_rate, utilization, total_score)
+    # Calculate scores and key signals
+    score, components, labels = _score_core(amount, tenor, on_time_rate, utilization)
+    amount_score, tenor_score, on_time_score, utilization_score = components
 
     return {
-        "score": round(total_score, 3),
-        "key_signals": key_signals,
+        "score": score,
+        "key_signals": _signal_dict(labels),
         "components": {
-            "amount_score": round(amount_score, 3),
-            "tenor_score": round(tenor_score, 3),
-            "on_time_score": round(on_time_score, 3),
-            "utilization_score": round(utilization_score, 3),
+            "amount_score": amount_score,
+            "tenor_score": tenor_score,
+            "on_time_score": on_time_score,
+            "utilization_score": utilization_score,
         },
         "weights": {
             "amount": AMOUNT_WEIGHT,
@@ -86,85 +77,182 @@ def score_bnpl(features: Dict[str, Any], *, random_state: int = 42) -> Dict[str,
     }
 
 
-def _calculate_amount_score(amount: float) -> float:
-    """Calculate amount component score (moderate amounts score higher)."""
-    # Normalize amount to [0, 1] range
-    normalized_amount = (amount - MIN_AMOUNT) / (MAX_AMOUNT - MIN_AMOUNT)
+def score_bnpl_batch(
+    features_batch: Union[Sequence[Dict[str, Any]], Mapping[str, Sequence[Any]]],
+    *,
+    random_state: int = 42,
+) -> List[Dict[str, Any]]:
+    """
+    Score a batch of BNPL applications.
 
-    # Optimal amount range is around 40-60% of max (moderate purchases)
-    optimal_range_start = 0.4
-    optimal_range_end = 0.6
+    Rows share the memoized scoring core, so repeated feature vectors within
+    a batch (or across batches) are only computed once.
 
-    if optimal_range_start <= normalized_amount <= optimal_range_end:
-        # In optimal range - higher score
-        return 0.9 + 0.1 * (1.0 - abs(normalized_amount - 0.5) / 0.1)
-    else:
-        # Outside optimal range - lower score
-        distance_from_optimal = min(
-            abs(normalized_amount - optimal_range_start), abs(normalized_amount - optimal_range_end)
+    Args:
+        features_batch: Either a sequence of BNPL feature dictionaries, or a
+            columnar mapping of feature name to equal-length value sequences
+            (missing columns take the score_bnpl defaults)
+        random_state: Accepted for API compatibility; see score_bnpl
+
+    Returns:
+        List of scoring results, in input order
+    """
+    if isinstance(features_batch, Mapping):
+        return _score_columns(features_batch)
+    return [score_bnpl(features, random_state=random_state) for features in features_batch]
+
+
+def _score_columns(columns: Mapping[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Score a columnar batch without materializing per-row feature dicts."""
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError("Feature columns must all have the same length")
+    size = lengths.pop() if lengths else 0
+
+    amounts = columns.get("amount", (0.0,) * size)
+    tenors = columns.get("tenor", (1,) * size)
+    on_time_rates = columns.get("on_time_rate", (0.0,) * size)
+    utilizations = columns.get("utilization", (0.0,) * size)
+
+    return [
+        _score_features(float(amount), int(tenor), float(on_time_rate), float(utilization))
+        for amount, tenor, on_time_rate, utilization in zip(
+            amounts, tenors, on_time_rates, utilizations
         )
-        return max(0.3, 0.9 - distance_from_optimal * 2.0)
+    ]
+
+
+# Hoisted scoring constants
+_AMOUNT_RANGE = MAX_AMOUNT - MIN_AMOUNT
+_INV_OPTIMAL_HALF_WIDTH = 1.0 / 0.1
+
+# Tenor component (shorter terms score higher): exponential decay for longer
+# terms, precomputed for every allowed tenor
+_TENOR_SCORES = tuple(
+    1.0 - ((tenor - MIN_TENOR) / (MAX_TENOR - MIN_TENOR)) ** 1.5
+    for tenor in range(MIN_TENOR, MAX_TENOR + 1)
+)
+
+
+def _score_components(
+    amount: float, tenor: int, on_time_rate: float, utilization: float
+) -> Tuple[float, float, float, float, float]:
+    """
+    Compute the weighted BNPL score for already-clamped features.
+
+    All component arithmetic lives in this one frame; memoization happens
+    once, around the whole scoring core, in _score_core.
+
+    Returns:
+        Tuple of (total, amount, tenor, on_time, utilization) scores
+    """
+    # Amount component (moderate amounts score higher): normalize to [0, 1];
+    # the optimal range is around 40-60% of max (moderate purchases)
+    normalized_amount = (amount - MIN_AMOUNT) / _AMOUNT_RANGE
+    if 0.4 <= normalized_amount <= 0.6:
+        amount_score = 0.9 + 0.1 * (1.0 - abs(normalized_amount - 0.5) * _INV_OPTIMAL_HALF_WIDTH)
+    else:
+        distance_from_optimal = min(abs(normalized_amount - 0.4), abs(normalized_amount - 0.6))
+        amount_score = max(0.3, 0.9 - distance_from_optimal * 2.0)
+
+    tenor_score = _TENOR_SCORES[tenor - MIN_TENOR]
+    on_time_score = on_time_rate  # Direct mapping
+    utilization_score = 1.0 - utilization  # Lower utilization is better
 
+    # Weighted total score
+    total_score = (
+        amount_score * AMOUNT_WEIGHT
+        + tenor_score * TENOR_WEIGHT
+        + on_time_score * ON_TIME_RATE_WEIGHT
+        + utilization_score * UTILIZATION_WEIGHT
+    )
 
-def _calculate_tenor_score(tenor: int) -> float:
-    """Calculate tenor component score (shorter terms score higher)."""
-    # Shorter terms are generally better for BNPL
-    # Score decreases as tenor increases
-    normalized_tenor = (tenor - MIN_TENOR) / (MAX_TENOR - MIN_TENOR)
+    # Ensure score is bounded
+    total_score = max(MIN_SCORE, min(MAX_SCORE, total_score))
 
-    # Exponential decay for longer terms
-    return 1.0 - (normalized_tenor**1.5)
+    return total_score, amount_score, tenor_score, on_time_score, utilization_score
+
+
+# Signal bands as (thresholds, labels) for bisect_right: a value lands in
+# labels[number of thresholds <= value]. Strict ">" boundaries are expressed
+# with math.nextafter so the boundary value itself stays in the lower band.
+_AMOUNT_BANDS = (
+    (500.0, math.nextafter(3000.0, math.inf)),
+    ("low_amount", "moderate_amount", "high_amount"),
+)
+_TENOR_BANDS = ((4, 9), ("short_term", "medium_term", "long_term"))
+_PAYMENT_BANDS = (
+    (0.70, 0.85, 0.95),
+    ("poor_history", "fair_history", "good_history", "excellent_history"),
+)
+_UTILIZATION_BANDS = (
+    (math.nextafter(0.3, math.inf), 0.8),
+    ("low_utilization", "moderate_utilization", "high_utilization"),
+)
+_RISK_BANDS = ((0.6, 0.8), ("high_risk", "medium_risk", "low_risk"))
+
+
+def _key_signal_labels(
+    amount: float, tenor: int, on_time_rate: float, utilization: float, total_score: float
+) -> Tuple[str, str, str, str, str]:
+    """Resolve the key signal labels, in _signal_dict order."""
+    return (
+        _AMOUNT_BANDS[1][bisect_right(_AMOUNT_BANDS[0], amount)],
+        _TENOR_BANDS[1][bisect_right(_TENOR_BANDS[0], tenor)],
+        _PAYMENT_BANDS[1][bisect_right(_PAYMENT_BANDS[0], on_time_rate)],
+        _UTILIZATION_BANDS[1][bisect_right(_UTILIZATION_BANDS[0], utilization)],
+        _RISK_BANDS[1][bisect_right(_RISK_BANDS[0], total_score)],
+    )
 
 
 def _generate_key_signals(
     amount: float, tenor: int, on_time_rate: float, utilization: float, total_score: float
 ) -> Dict[str, Any]:
     """Generate key signals for the BNPL decision."""
-    signals = {}
+    return _signal_dict(_key_signal_labels(amount, tenor, on_time_rate, utilization, total_score))
 
-    # Amount-based signals
-    if amount < 500:
-        signals["amount_signal"] = "low_amount"
-    elif amount > 3000:
-        signals["amount_signal"] = "high_amount"
-    else:
-        signals["amount_signal"] = "moderate_amount"
 
-    # Tenor-based signals
-    if tenor <= 3:
-        signals["tenor_signal"] = "short_term"
-    elif tenor >= 9:
-        signals["tenor_signal"] = "long_term"
-    else:
-        signals["tenor_signal"] = "medium_term"
-
-    # Payment history signals
-    if on_time_rate >= 0.95:
-        signals["payment_signal"] = "excellent_history"
-    elif on_time_rate >= 0.85:
-        signals["payment_signal"] = "good_history"
-    elif on_time_rate >= 0.70:
-        signals["payment_signal"] = "fair_history"
-    else:
-        signals["payment_signal"] = "poor_history"
+# Result dicts are always built from literals in one fixed key order, so every
+# response shares the same layout; the keys and labels are interned literals
+def _signal_dict(labels: Tuple[str, str, str, str, str]) -> Dict[str, str]:
+    """Build the key_signals dict from labels in _key_signal_labels order."""
+    amount_signal, tenor_signal, payment_signal, utilization_signal, risk_signal = labels
+    return {
+        "amount_signal": amount_signal,
+        "tenor_signal": tenor_signal,
+        "payment_signal": payment_signal,
+        "utilization_signal": utilization_signal,
+        "risk_signal": risk_signal,
+    }
 
-    # Utilization signals
-    if utilization <= 0.3:
-        signals["utilization_signal"] = "low_utilization"
-    elif utilization >= 0.8:
-        signals["utilization_signal"] = "high_utilization"
-    else:
-        signals["utilization_signal"] = "moderate_utilization"
 
-    # Overall risk signals
-    if total_score >= 0.8:
-        signals["risk_signal"] = "low_risk"
-    elif total_score >= 0.6:
-        signals["risk_signal"] = "medium_risk"
-    else:
-        signals["risk_signal"] = "high_risk"
+@lru_cache(maxsize=4096)
+def _score_core(
+    amount: float, tenor: int, on_time_rate: float, utilization: float
+) -> Tuple[float, Tuple[float, float, float, float], Tuple[str, str, str, str, str]]:
+    """
+    Score clamped features: the single memoized scoring kernel.
 
-    return signals
+    score_bnpl and compute_bnpl_response both go through here, so each pays
+    one cache lookup for the score, its components and its key signals.
+
+    Returns:
+        Tuple of (score rounded to 3dp, component scores rounded to 3dp,
+        key signal labels)
+    """
+    total_score, amount_score, tenor_score, on_time_score, utilization_score = _score_components(
+        amount, tenor, on_time_rate, utilization
+    )
+    return (
+        round(total_score, 3),
+        (
+            round(amount_score, 3),
+            round(tenor_score, 3),
+            round(on_time_score, 3),
+            round(utilization_score, 3),
+        ),
+        _key_signal_labels(amount, tenor, on_time_rate, utilization, total_score),
+    )
 
 
 def generate_bnpl_quote(score: float, amount: float, tenor: int) -> Dict[str, Any]:
@@ -179,6 +267,26 @@ def generate_bnpl_quote(score: float, amount: float, tenor: int) -> Dict[str, An
     Returns:
         BNPL quote with limit, APR, and term
     """
+    limit, apr, approved_term, monthly_payment = _quote_terms(score, amount, tenor)
+
+    return {
+        "limit": limit,
+        "apr": apr,
+        "term_months": approved_term,
+        "monthly_payment": monthly_payment,
+        "score": score,
+        "approved": score >= 0.5,  # Minimum threshold for approval
+    }
+
+
+@lru_cache(maxsize=4096)
+def _quote_terms(score: float, amount: float, tenor: int) -> Tuple[float, float, int, float]:
+    """
+    Compute the rounded quote terms for a score, amount and tenor.
+
+    Returns:
+        Tuple of (limit, apr, term_months, monthly_payment)
+    """
     # Calculate approved limit (percentage of requested amount based on score)
     limit_multiplier = 0.5 + (score * 0.5)  # 50-100% of requested amount
     approved_limit = min(amount * limit_multiplier, MAX_AMOUNT)
@@ -196,14 +304,12 @@ def generate_bnpl_quote(score: float, amount: float, tenor: int) -> Dict[str, An
     else:
         approved_term = min(tenor + 2, MAX_TENOR)  # Longer term for higher risk
 
-    return {
-        "limit": round(approved_limit, 2),
-        "apr": round(apr, 2),
-        "term_months": approved_term,
-        "monthly_payment": round(approved_limit / approved_term, 2),
-        "score": score,
-        "approved": score >= 0.5,  # Minimum threshold for approval
-    }
+    return (
+        round(approved_limit, 2),
+        round(apr, 2),
+        approved_term,
+        round(approved_limit / approved_term, 2),
+    )
 
 
 def validate_features(features: Dict[str, Any]) -> Dict[str, Any]:
@@ -224,3 +330,75 @@ def validate_features(features: Dict[str, Any]) -> Dict[str, Any]:
     }
 
     return validated
+
+
+def compute_bnpl_response(
+    amount: float, tenor: int, on_time_rate: float = 0.0, utilization: float = 0.0
+) -> Dict[str, Any]:
+    """
+    Validate, score and quote a BNPL application in one pass.
+
+    Equivalent to validate_features, then score_bnpl, then generate_bnpl_quote,
+    but without the intermediate feature, scoring and quote dicts.
+
+    Args:
+        amount: Requested amount
+        tenor: Requested tenor in months
+        on_time_rate: On-time payment rate (0-1)
+        utilization: Credit utilization (0-1)
+
+    Returns:
+        BNPL quote fields (limit, apr, term_months, monthly_payment, score,
+        approved) plus key_signals and components
+    """
+    quote, key_signals, components = _bnpl_response_values(
+        float(amount), int(tenor), float(on_time_rate), float(utilization)
+    )
+    limit, apr, term_months, monthly_payment, score, approved = quote
+    amount_score, tenor_score, on_time_score, utilization_score = components
+
+    return {
+        "limit": limit,
+        "apr": apr,
+        "term_months": term_months,
+        "monthly_payment": monthly_payment,
+        "score": score,
+        "approved": approved,
+        "key_signals": _signal_dict(key_signals),
+        "components": {
+            "amount_score": amount_score,
+            "tenor_score": tenor_score,
+            "on_time_score": on_time_score,
+            "utilization_score": utilization_score,
+        },
+    }
+
+
+def _bnpl_response_values(
+    amount: float, tenor: int, on_time_rate: float, utilization: float
+) -> Tuple[
+    Tuple[float, float, int, float, float, bool],
+    Tuple[str, str, str, str, str],
+    Tuple[float, float, float, float],
+]:
+    """
+    Compute the BNPL response for raw feature values as immutable tuples.
+
+    Memoization lives in _score_core and _quote_terms, which the standalone
+    score_bnpl and generate_bnpl_quote share, so this adds no cache of its own.
+
+    Returns:
+        Tuple of (quote values, key signal labels, component scores), each
+        in response key order
+    """
+    # Clamp as validate_features does; the score and the quote both use the
+    # clamped values, matching the three-call pipeline
+    amount = max(MIN_AMOUNT, min(MAX_AMOUNT, amount))
+    tenor = max(MIN_TENOR, min(MAX_TENOR, tenor))
+    on_time_rate = max(0.0, min(1.0, on_time_rate))
+    utilization = max(0.0, min(1.0, utilization))
+
+    score, components, labels = _score_core(amount, tenor, on_time_rate, utilization)
+    limit, apr, term_months, monthly_payment = _quote_terms(score, amount, tenor)
+
+    return (limit, apr, term_months, monthly_payment, score, score >= 0.5), labels, components
@@ -4,146 +4,218 @@ Okra CloudEvents module.
 Handles emission and validation of CloudEvents for BNPL quotes.
 """
 
-import json
-import uuid
+import os
+import threading
+import time
 from datetime import datetime, timezone
-from typing import Any, Dict
+from typing import (
+    Annotated,
+    Any,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    TypedDict,
+    Union,
+)
+
+import orjson
+from pydantic import (
+    BaseModel,
+    Discriminator,
+    Field,
+    StrictBool,
+    StrictFloat,
+    StrictInt,
+    Tag,
+    TypeAdapter,
+    ValidationError,
+)
+
+# Random bytes are drawn from os.urandom in blocks of this many UUIDs and held
+# per thread as hex, so most IDs cost a string slice rather than a syscall
+_UUID_POOL_SIZE = 256
+_uuid_pool = threading.local()
+
+
+def _reset_uuid_pool() -> None:
+    """Drop pooled randomness so a forked child never reuses its parent's IDs."""
+    global _uuid_pool
+    _uuid_pool = threading.local()
+
+
+os.register_at_fork(after_in_child=_reset_uuid_pool)
+
+
+def _uuid4_str() -> str:
+    """
+    Return a random RFC 4122 version-4 UUID in canonical hyphenated form.
+
+    Equivalent to str(uuid.uuid4()) but formats pooled random bytes directly
+    instead of building and stringifying a UUID object.
+    """
+    pool = _uuid_pool
+    offset = getattr(pool, "offset", _UUID_POOL_SIZE * 32)
+    if offset >= _UUID_POOL_SIZE * 32:
+        pool.hex = os.urandom(_UUID_POOL_SIZE * 16).hex()
+        offset = 0
+    pool.offset = offset + 32
+    h = pool.hex[offset : offset + 32]
+    variant = "89ab"[int(h[16], 16) & 3]
+    return f"{h[:8]}-{h[8:12]}-4{h[13:16]}-{variant}{h[17:20]}-{h[20:]}"
+
+
+# Last formatted timestamp, refreshed at most once per second: [epoch_second, iso_string]
+_TS_CACHE: list = [-1, ""]
 
-from pydantic import BaseModel, Field
+
+def _iso_now() -> str:
+    """Return the current UTC time as an ISO 8601 string, at one-second resolution."""
+    now = int(time.time())
+    if now != _TS_CACHE[0]:
+        _TS_CACHE[:] = [now, datetime.fromtimestamp(now, timezone.utc).isoformat()]
+    return _TS_CACHE[1]
 
 
 class BNPLQuoteEvent(BaseModel):
-    """CloudEvent model for Okra BNPL quotes."""
+    """CloudEvent model for Okra BNPL quotes (documents the shape emitted by emit_bnpl_quote_ce)."""
 
     specversion: str = "1.0"
     type: str = "ocn.okra.bnpl_quote.v1"
     source: str = "okra"
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    time: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    id: str = Field(default_factory=_uuid4_str)
+    time: str = Field(default_factory=_iso_now)
     subject: str  # trace_id
     datacontenttype: str = "application/json"
     data: Dict[str, Any]
 
 
-def emit_bnpl_quote_ce(trace_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+def emit_bnpl_quote_ce(
+    trace_id: str, payload: Dict[str, Any], *, now: Optional[str] = None
+) -> Dict[str, Any]:
     """
     Emit a CloudEvent for BNPL quote.
 
     Args:
         trace_id: Trace ID for the request
         payload: BNPL quote payload
+        now: Event time from get_event_time(), so callers can share one clock
+            reading with the payload timestamp; read here when omitted
 
     Returns:
-        CloudEvent envelope
+        CloudEvent envelope matching BNPLQuoteEvent; data references the payload
     """
-    event = BNPLQuoteEvent(subject=trace_id, data=payload)
+    # Built as a plain dict: every field is either constant or produced here,
+    # so constructing and dumping a BNPLQuoteEvent would only copy it
+    return {
+        "specversion": "1.0",
+        "type": "ocn.okra.bnpl_quote.v1",
+        "source": "okra",
+        "id": _uuid4_str(),
+        "time": now if now is not None else _iso_now(),
+        "subject": trace_id,
+        "datacontenttype": "application/json",
+        "data": payload,
+    }
 
-    return event.model_dump()
 
+def emit_bnpl_quote_ce_batch(
+    items: Sequence[Tuple[str, Dict[str, Any]]], *, now: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Emit CloudEvents for a batch of BNPL quotes.
 
-def validate_ce_schema(event: Dict[str, Any]) -> bool:
+    Args:
+        items: Sequence of (trace_id, payload) pairs
+        now: Event time shared by the whole batch; read once here when omitted
+
+    Returns:
+        List of CloudEvent envelopes, in input order, ready to be serialized
+        together in a single call
+    """
+    if now is None:
+        now = _iso_now()
+    return [emit_bnpl_quote_ce(trace_id, payload, now=now) for trace_id, payload in items]
+
+
+# validate_ce_schema only needs a pass/fail answer, so the shapes below are
+# TypedDicts: pydantic-core checks them without instantiating model objects
+
+
+class _BNPLQuoteFields(TypedDict):
+    """Required BNPL quote fields checked by validate_ce_schema."""
+
+    limit: Any
+    apr: Any
+    term_months: Any
+    monthly_payment: Any
+    # Any int or float in [0, 1]; bools count as ints, as in isinstance checks
+    score: Union[StrictBool, Annotated[Union[StrictInt, StrictFloat], Field(ge=0, le=1)]]
+    approved: StrictBool
+
+
+class _BNPLQuotePayload(TypedDict):
+    """Nested payload structure produced by create_bnpl_quote_payload."""
+
+    quote: _BNPLQuoteFields
+
+
+def _payload_shape(data: Any) -> str:
+    """Route payloads with a "quote" key to the nested shape, others to the legacy one."""
+    return "nested" if isinstance(data, dict) and "quote" in data else "direct"
+
+
+class _BNPLQuoteEnvelope(TypedDict):
+    """CloudEvent envelope accepted by validate_ce_schema."""
+
+    specversion: Literal["1.0"]
+    type: Literal["ocn.okra.bnpl_quote.v1"]
+    source: Literal["okra"]
+    id: Any
+    time: Any
+    subject: Any
+    datacontenttype: Literal["application/json"]
+    data: Annotated[
+        Union[
+            Annotated[_BNPLQuotePayload, Tag("nested")],
+            Annotated[_BNPLQuoteFields, Tag("direct")],  # Direct structure (legacy)
+        ],
+        Discriminator(_payload_shape),
+    ]
+
+
+# Compiled once; validation runs entirely inside pydantic-core
+_CE_ENVELOPE_ADAPTER = TypeAdapter(_BNPLQuoteEnvelope)
+
+
+def validate_ce_schema(event: Union[Dict[str, Any], bytes]) -> bool:
     """
     Validate CloudEvent against ocn.okra.bnpl_quote.v1 schema.
 
     Args:
-        event: CloudEvent to validate
+        event: CloudEvent to validate, as a dict or raw JSON bytes
 
     Returns:
         True if valid, False otherwise
     """
     try:
-        # Check required fields
-        required_fields = [
-            "specversion",
-            "type",
-            "source",
-            "id",
-            "time",
-            "subject",
-            "datacontenttype",
-            "data",
-        ]
-
-        for field in required_fields:
-            if field not in event:
-                return False
-
-        # Validate specversion
-        if event["specversion"] != "1.0":
-            return False
-
-        # Validate type
-        if event["type"] != "ocn.okra.bnpl_quote.v1":
-            return False
-
-        # Validate source
-        if event["source"] != "okra":
-            return False
-
-        # Validate datacontenttype
-        if event["datacontenttype"] != "application/json":
-            return False
-
-        # Validate data structure
-        data = event["data"]
-        if not isinstance(data, dict):
-            return False
-
-        # Check required data fields - handle nested structure
-        if "quote" in data:
-            # Nested structure from create_bnpl_quote_payload
-            quote = data["quote"]
-            required_fields = [
-                "limit",
-                "apr",
-                "term_months",
-                "monthly_payment",
-                "score",
-                "approved",
-            ]
-            for field in required_fields:
-                if field not in quote:
-                    return False
-
-            # Validate score is a number between 0 and 1
-            score = quote["score"]
-            if not isinstance(score, (int, float)) or not (0 <= score <= 1):
-                return False
-
-            # Validate approved is boolean
-            if not isinstance(quote["approved"], bool):
-                return False
+        if isinstance(event, bytes):
+            _CE_ENVELOPE_ADAPTER.validate_json(event)
         else:
-            # Direct structure (legacy)
-            required_data_fields = [
-                "limit",
-                "apr",
-                "term_months",
-                "monthly_payment",
-                "score",
-                "approved",
-            ]
-            for field in required_data_fields:
-                if field not in data:
-                    return False
-
-            # Validate score is a number between 0 and 1
-            score = data["score"]
-            if not isinstance(score, (int, float)) or not (0 <= score <= 1):
-                return False
-
-            # Validate approved is boolean
-            if not isinstance(data["approved"], bool):
-                return False
-
-        return True
-
-    except Exception:
+            _CE_ENVELOPE_ADAPTER.validate_python(event)
+    except ValidationError:
         return False
+    return True
 
 
 def create_bnpl_quote_payload(
-    quote: Dict[str, Any], features: Dict[str, Any], key_signals: Dict[str, Any]
+    quote: Dict[str, Any],
+    features: Dict[str, Any],
+    key_signals: Dict[str, Any],
+    *,
+    now: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Create BNPL quote payload for CloudEvent.
@@ -152,15 +224,20 @@ def create_bnpl_quote_payload(
         quote: BNPL quote information
         features: Input features
         key_signals: Key signals from scoring
+        now: Timestamp from get_event_time(); read here when omitted
 
     Returns:
-        Payload dictionary
+        Payload dictionary. The timestamp is an ISO 8601 string rather than a
+        datetime so events round-trip through any JSON encoder unchanged; the
+        string comes from the per-second cache in _iso_now().
     """
     return {
         "quote": quote,
         "features": features,
         "key_signals": key_signals,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": now if now is not None else _iso_now(),
+        # Built per payload: events carry the payload by reference, so a shared
+        # dict would let one consumer's edits reach every later event
         "metadata": {"service": "okra", "version": "1.0.0", "feature": "bnpl_scoring"},
     }
 
@@ -172,7 +249,17 @@ def get_trace_id() -> str:
     Returns:
         Trace ID string
     """
-    return str(uuid.uuid4())
+    return _uuid4_str()
+
+
+def get_event_time() -> str:
+    """
+    Read the clock once for an event and its payload.
+
+    Returns:
+        Current UTC time as an ISO 8601 string, at one-second resolution
+    """
+    return _iso_now()
 
 
 def format_ce_for_logging(event: Dict[str, Any]) -> str:
@@ -185,4 +272,4 @@ def format_ce_for_logging(event: Dict[str, Any]) -> str:
     Returns:
         Formatted string for logging
     """
-    return json.dumps(event, indent=2)
+    return orjson.dumps(event, option=orjson.OPT_INDENT_2).decode()
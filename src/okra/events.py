@@ -2,15 +2,21 @@
 CloudEvents emitter for Okra credit quotes.
 """
 
+import logging
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 from uuid import uuid4
 
-from pydantic import BaseModel
+import orjson
+from pydantic import BaseModel, ConfigDict
+
+logger = logging.getLogger(__name__)
 
 
 class CreditQuoteEvent(BaseModel):
-    """CloudEvent for credit quotes."""
+    """CloudEvent for credit quotes (documents the shape emitted by emit_credit_quote_event)."""
+
+    model_config = ConfigDict(frozen=True, extra="forbid")
 
     specversion: str = "1.0"
     id: str
@@ -26,6 +32,8 @@ class CreditQuoteEvent(BaseModel):
 class CreditQuoteData(BaseModel):
     """Data payload for credit quote events."""
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     quote_id: str
     actor_id: str
     mandate: Dict[str, Any]
@@ -34,13 +42,31 @@ class CreditQuoteData(BaseModel):
     timestamp: str
 
 
+def _identity(value: Any) -> Any:
+    """Return the value unchanged."""
+    return value
+
+
+def _mandate_converter(kind: type) -> Callable[[Any], Any]:
+    """Pick how mandates of a given type are converted to dicts."""
+    if hasattr(kind, "model_dump"):
+        return kind.model_dump
+    if hasattr(kind, "dict"):
+        return kind.dict
+    return _identity
+
+
+# Mandate-to-dict converters, resolved once per mandate type
+_MANDATE_CONVERTERS: Dict[type, Callable[[Any], Any]] = {}
+
+
 async def emit_credit_quote_event(
     quote_id: str,
     actor_id: str,
     mandate: Any,  # Can be AP2Mandate or Dict
     quote: Any,  # CreditQuote from policies
     source: str = "https://okra.ocn.ai/v1",
-) -> CreditQuoteEvent:
+) -> Dict[str, Any]:
     """
     Emit a CloudEvent for a credit quote.
 
@@ -52,7 +78,8 @@ async def emit_credit_quote_event(
         source: Event source URI
 
     Returns:
-        CloudEvent object (in production, this would be sent to an event bus)
+        CloudEvent dictionary matching CreditQuoteEvent (in production, this
+        would be sent to an event bus)
     """
     # Convert quote to dict for serialization
     quote_data = {
@@ -66,35 +93,42 @@ async def emit_credit_quote_event(
         "policy_version": quote.policy_version,
     }
 
-    # Convert mandate to dict if it's a Pydantic model
-    mandate_dict = mandate
-    if hasattr(mandate, "model_dump"):
-        mandate_dict = mandate.model_dump()
-    elif hasattr(mandate, "dict"):
-        mandate_dict = mandate.dict()
-
-    # Create event data
-    event_data = CreditQuoteData(
-        quote_id=quote_id,
-        actor_id=actor_id,
-        mandate=mandate_dict,
-        quote_result=quote_data,
-        policy_version=quote.policy_version,
-        timestamp=datetime.now(timezone.utc).isoformat(),
-    )
-
-    # Create CloudEvent
-    event = CreditQuoteEvent(
-        id=str(uuid4()),
-        source=source,
-        subject=actor_id,  # Use actor_id as subject
-        time=datetime.now(timezone.utc).isoformat(),
-        data=event_data.model_dump(),
-    )
+    # Convert mandate to dict if it's a Pydantic model (MCP callers already pass a dict)
+    if isinstance(mandate, dict):
+        mandate_dict = mandate
+    else:
+        convert = _MANDATE_CONVERTERS.get(type(mandate))
+        if convert is None:
+            convert = _MANDATE_CONVERTERS[type(mandate)] = _mandate_converter(type(mandate))
+        mandate_dict = convert(mandate)
+
+    # Event time and payload timestamp describe the same instant
+    now_iso = datetime.now(timezone.utc).isoformat()
+
+    # Build the CloudEvent as a plain dict; the models above document its shape
+    event = {
+        "specversion": "1.0",
+        "id": str(uuid4()),
+        "source": source,
+        "type": "ocn.okra.credit_quote.v1",
+        "subject": actor_id,  # Use actor_id as subject
+        "time": now_iso,
+        "datacontenttype": "application/json",
+        "dataschema": None,
+        "data": {
+            "quote_id": quote_id,
+            "actor_id": actor_id,
+            "mandate": mandate_dict,
+            "quote_result": quote_data,
+            "policy_version": quote.policy_version,
+            "timestamp": now_iso,
+        },
+    }
 
     # In production, this would send the event to an event bus
-    # For now, we'll just log it
-    print(f"Credit Quote Event: {event.model_dump_json()}")
+    # For now, we'll just log it (serializing only when debug logging is on)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Credit Quote Event: %s", orjson.dumps(event).decode())
 
     return event
 
@@ -187,3 +221,6 @@ CREDIT_QUOTE_EVENT_SCHEMA = {
         },
     },
 }
+
+# CREDIT_QUOTE_EVENT_SCHEMA serialized once for consumers that serve it as JSON
+CREDIT_QUOTE_EVENT_SCHEMA_JSON = orjson.dumps(CREDIT_QUOTE_EVENT_SCHEMA)
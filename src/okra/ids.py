@@ -0,0 +1,56 @@
+"""
+Deterministic identifiers for Okra credit quotes.
+"""
+
+import hashlib
+import json
+import struct
+from typing import Any, Mapping, Optional
+
+import orjson
+
+
+def _profile_bytes(profile: Optional[Mapping[str, Any]]) -> bytes:
+    """Serialize a raw client profile with sorted keys for hashing."""
+    if not profile:
+        return b""
+    try:
+        return orjson.dumps(profile, option=orjson.OPT_SORT_KEYS)
+    except orjson.JSONEncodeError:
+        # Profiles are client JSON and may hold values orjson rejects, such as
+        # integers beyond 64 bits; the stdlib encoder handles any of them
+        return json.dumps(profile, sort_keys=True, default=str).encode()
+
+
+def derive_quote_id(
+    actor_id: str,
+    amount: str,
+    term_months: int,
+    purpose: str,
+    profile: Optional[Mapping[str, Any]] = None,
+) -> str:
+    """
+    Derive a deterministic quote ID from a credit request's pricing inputs.
+
+    The ID is stable across processes, unlike one built from the builtin hash.
+
+    Args:
+        actor_id: Actor/borrower identifier
+        amount: Requested amount, as the caller formats it
+        term_months: Loan term in months
+        purpose: Loan purpose
+        profile: Raw credit profile data from the client, if any
+
+    Returns:
+        Quote ID of the form quote_<actor_id>_<hex digest>
+    """
+    buf = b"|".join(
+        [
+            actor_id.encode(),
+            amount.encode(),
+            struct.pack("<H", term_months),
+            purpose.encode(),
+            _profile_bytes(profile),
+        ]
+    )
+    return f"quote_{actor_id}_{hashlib.blake2b(buf, digest_size=16).hexdigest()}"
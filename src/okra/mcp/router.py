@@ -0,0 +1,94 @@
+"""
+HTTP router exposing Okra MCP verbs at /mcp/invoke.
+"""
+
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, Mapping, NotRequired, TypedDict
+import orjson
+from fastapi import APIRouter, Depends, Response
+from pydantic import BaseModel
+
+from ..responses import ORJSONResponse, PrerenderedJSONResponse
+from ..validation import json_body, json_body_openapi
+
+router = APIRouter(default_response_class=ORJSONResponse)
+
+
+# A TypedDict rather than a model: the body is validated straight into a plain
+# dict, with no model instance built per request
+class MCPRequest(TypedDict):
+    """MCP request model."""
+
+    verb: str
+    args: NotRequired[Dict[str, Any]]
+
+
+class MCPResponse(BaseModel):
+    """MCP response model."""
+
+    ok: bool
+    data: Any = None
+    error: Any = None
+
+
+# Verb payloads are deterministic: keep read-only views of the data and
+# serialize the full responses once at import time
+_STATUS_DATA = MappingProxyType({"agent": "okra", "status": "active"})
+_CREDIT_QUOTE_DATA = MappingProxyType(
+    {
+        "agent": "okra",
+        "quote_id": "quote_stub_12345",
+        "approved": True,
+        "credit_limit": 25000.0,
+        "apr": 8.5,
+        "term_months": 12,
+        "monthly_payment": 2196.75,
+        "reasons": ("Good credit profile", "Low debt-to-income ratio"),
+        "review_required": False,
+        "policy_version": "v1.0",
+        "description": "Deterministic stub credit quote for testing",
+    }
+)
+
+_STATUS_BYTES = orjson.dumps({"ok": True, "data": dict(_STATUS_DATA)})
+_CREDIT_QUOTE_BYTES = orjson.dumps({"ok": True, "data": dict(_CREDIT_QUOTE_DATA)})
+
+
+async def _handle_status(args: Dict[str, Any]) -> Response:
+    """Return agent status."""
+    return PrerenderedJSONResponse(_STATUS_BYTES)
+
+
+async def _handle_credit_quote(args: Dict[str, Any]) -> Response:
+    """Return the deterministic stub credit quote."""
+    return PrerenderedJSONResponse(_CREDIT_QUOTE_BYTES)
+
+
+# Verb dispatch table (read-only); every handler takes the verb args and returns
+# a response, and unknown verbs miss the single lookup in invoke_mcp_verb
+_HANDLERS: Mapping[str, Callable[[Dict[str, Any]], Awaitable[Response]]] = MappingProxyType(
+    {
+        "getStatus": _handle_status,
+        "getCreditQuote": _handle_credit_quote,
+    }
+)
+
+
+@router.post(
+    "/mcp/invoke",
+    responses={200: {"model": MCPResponse}},
+    openapi_extra=json_body_openapi(MCPRequest),
+)
+async def invoke_mcp_verb(request: MCPRequest = Depends(json_body(MCPRequest))) -> Response:
+    """
+    Handle MCP protocol requests.
+
+    Supported verbs:
+    - getStatus: Returns agent status
+    - getCreditQuote: Returns deterministic stub credit quote
+    """
+    verb = request["verb"]
+    handler = _HANDLERS.get(verb)
+    if handler is None:
+        return ORJSONResponse({"ok": False, "error": f"Unsupported verb: {verb}"})
+    return await handler(request.get("args", {}))
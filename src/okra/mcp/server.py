@@ -3,8 +3,10 @@ MCP server for Okra credit agent.
 """
 
 import asyncio
-import json
-from typing import Any, Dict
+import logging
+from typing import Any, Awaitable, Callable, Dict, List
+
+import orjson
 
 from mcp.server import NotificationOptions, Server  # type: ignore
 from mcp.server.models import InitializationOptions  # type: ignore
@@ -21,126 +23,194 @@ from mcp.types import (  # type: ignore
 
 from ..policies import CreditPolicies, CreditRequest, CreditProfile
 from ..events import emit_credit_quote_event
-from ..bnpl import score_bnpl, generate_bnpl_quote, validate_features
+from ..ids import derive_quote_id
+from ..bnpl import compute_bnpl_response
 
+logger = logging.getLogger(__name__)
 
 # MCP Server instance
 server = Server("okra-credit-agent")
 
 
-@server.list_tools()
-async def handle_list_tools() -> ListToolsResult:
-    """List available tools."""
-    tools = [
-        Tool(
-            name="getCreditQuote",
-            description="Get a credit quote based on AP2 mandate and credit profile",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "mandate": {
-                        "type": "object",
-                        "description": "AP2-aligned mandate with actor, cart, and payment context",
-                        "properties": {
-                            "actor": {"type": "object", "description": "Actor information"},
-                            "cart": {
-                                "type": "object",
-                                "description": "Cart/transaction information",
-                            },
-                            "payment": {"type": "object", "description": "Payment context"},
-                        },
-                        "required": ["actor", "cart", "payment"],
-                    },
-                    "credit_profile": {
-                        "type": "object",
-                        "description": "Credit profile information",
-                        "properties": {
-                            "credit_score": {"type": "integer", "minimum": 300, "maximum": 850},
-                            "annual_income": {"type": "number", "minimum": 0},
-                            "debt_to_income_ratio": {"type": "number", "minimum": 0, "maximum": 1},
-                            "employment_status": {"type": "string"},
-                            "credit_history_months": {"type": "integer", "minimum": 0},
+def _dumps(obj: Any) -> str:
+    """
+    Serialize tool output as indented JSON text using orjson.
+
+    Tool results also carry the same data as structuredContent, so clients that
+    read it can skip parsing this text.
+    """
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+
+def _policies_text() -> str:
+    """Return the indented JSON policy listing for the current policy version."""
+    return CreditPolicies.list_policies_json(indent=True).decode()
+
+
+# Pending credit quote event emissions, drained in batches by _event_worker
+_EVENT_QUEUE_SIZE = 10_000
+_EVENT_BATCH_SIZE = 100
+_EVENT_BATCH_WAIT = 0.1  # seconds to wait for a batch to fill after its first event
+_event_queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=_EVENT_QUEUE_SIZE)
+
+
+async def _emit_event_batch(batch: List[Dict[str, Any]]) -> None:
+    """Emit a batch of queued credit quote events."""
+    for event_args in batch:
+        try:
+            await emit_credit_quote_event(**event_args)
+        except Exception as e:
+            logger.warning("Failed to emit credit quote event: %s", e)
+        finally:
+            _event_queue.task_done()
+
+
+async def _event_worker() -> None:
+    """Drain the event queue, emitting up to _EVENT_BATCH_SIZE events per flush."""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _event_queue.get()]
+        deadline = loop.time() + _EVENT_BATCH_WAIT
+        while len(batch) < _EVENT_BATCH_SIZE:
+            try:
+                batch.append(_event_queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(_event_queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        await _emit_event_batch(batch)
+
+
+# Tool and resource listings are static, so build them once at import time
+_TOOLS = [
+    Tool(
+        name="getCreditQuote",
+        description="Get a credit quote based on AP2 mandate and credit profile",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "mandate": {
+                    "type": "object",
+                    "description": "AP2-aligned mandate with actor, cart, and payment context",
+                    "properties": {
+                        "actor": {"type": "object", "description": "Actor information"},
+                        "cart": {
+                            "type": "object",
+                            "description": "Cart/transaction information",
                         },
+                        "payment": {"type": "object", "description": "Payment context"},
                     },
-                    "requested_amount": {
-                        "type": "number",
-                        "minimum": 0,
-                        "description": "Requested credit amount",
-                    },
-                    "term_months": {
-                        "type": "integer",
-                        "minimum": 1,
-                        "maximum": 60,
-                        "description": "Loan term in months",
-                    },
-                    "purpose": {
-                        "type": "string",
-                        "description": "Loan purpose",
-                        "default": "general",
+                    "required": ["actor", "cart", "payment"],
+                },
+                "credit_profile": {
+                    "type": "object",
+                    "description": "Credit profile information",
+                    "properties": {
+                        "credit_score": {"type": "integer", "minimum": 300, "maximum": 850},
+                        "annual_income": {"type": "number", "minimum": 0},
+                        "debt_to_income_ratio": {"type": "number", "minimum": 0, "maximum": 1},
+                        "employment_status": {"type": "string"},
+                        "credit_history_months": {"type": "integer", "minimum": 0},
                     },
                 },
-                "required": ["mandate", "requested_amount", "term_months"],
+                "requested_amount": {
+                    "type": "number",
+                    "minimum": 0,
+                    "description": "Requested credit amount",
+                },
+                "term_months": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "maximum": 60,
+                    "description": "Loan term in months",
+                },
+                "purpose": {
+                    "type": "string",
+                    "description": "Loan purpose",
+                    "default": "general",
+                },
             },
-        ),
-        Tool(
-            name="getBnplQuote",
-            description="Get a BNPL (Buy Now, Pay Later) quote with deterministic scoring",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "amount": {
-                        "type": "number",
-                        "minimum": 100,
-                        "maximum": 5000,
-                        "description": "Requested BNPL amount",
-                    },
-                    "tenor": {
-                        "type": "integer",
-                        "minimum": 1,
-                        "maximum": 12,
-                        "description": "Payment term in months",
-                    },
-                    "on_time_rate": {
-                        "type": "number",
-                        "minimum": 0.0,
-                        "maximum": 1.0,
-                        "description": "Historical on-time payment rate",
-                        "default": 0.0,
-                    },
-                    "utilization": {
-                        "type": "number",
-                        "minimum": 0.0,
-                        "maximum": 1.0,
-                        "description": "Current credit utilization",
-                        "default": 0.0,
-                    },
+            "required": ["mandate", "requested_amount", "term_months"],
+        },
+    ),
+    Tool(
+        name="getBnplQuote",
+        description="Get a BNPL (Buy Now, Pay Later) quote with deterministic scoring",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "amount": {
+                    "type": "number",
+                    "minimum": 100,
+                    "maximum": 5000,
+                    "description": "Requested BNPL amount",
+                },
+                "tenor": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "maximum": 12,
+                    "description": "Payment term in months",
+                },
+                "on_time_rate": {
+                    "type": "number",
+                    "minimum": 0.0,
+                    "maximum": 1.0,
+                    "description": "Historical on-time payment rate",
+                    "default": 0.0,
+                },
+                "utilization": {
+                    "type": "number",
+                    "minimum": 0.0,
+                    "maximum": 1.0,
+                    "description": "Current credit utilization",
+                    "default": 0.0,
                 },
-                "required": ["amount", "tenor"],
             },
-        ),
-        Tool(
-            name="listPolicies",
-            description="List current credit policies and parameters",
-            inputSchema={"type": "object", "properties": {}, "required": []},
-        ),
+            "required": ["amount", "tenor"],
+        },
+    ),
+    Tool(
+        name="listPolicies",
+        description="List current credit policies and parameters",
+        inputSchema={"type": "object", "properties": {}, "required": []},
+    ),
+]
+_LIST_TOOLS_RESULT = ListToolsResult(tools=_TOOLS)
+
+_LIST_RESOURCES_RESULT = ListResourcesResult(
+    resources=[
+        Resource(  # type: ignore
+            uri="okra://policies",  # type: ignore
+            name="Credit Policies",
+            description="Current credit policies and parameters",
+            mimeType="application/json",
+        )
     ]
-    return ListToolsResult(tools=tools)
+)
+
+
+@server.list_tools()
+async def handle_list_tools() -> ListToolsResult:
+    """List available tools."""
+    return _LIST_TOOLS_RESULT
 
 
 @server.call_tool()
 async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> CallToolResult:
     """Handle tool calls."""
+    handler = _TOOL_HANDLERS.get(name)
+    if handler is None:
+        return CallToolResult(
+            content=[TextContent(type="text", text=f"Unknown tool: {name}")], isError=True
+        )
     try:
-        if name == "getCreditQuote":
-            return await handle_get_credit_quote(arguments)
-        elif name == "getBnplQuote":
-            return await handle_get_bnpl_quote(arguments)
-        elif name == "listPolicies":
-            return await handle_list_policies()
-        else:
-            return CallToolResult(
-                content=[TextContent(type="text", text=f"Unknown tool: {name}")], isError=True
-            )
+        return await handler(arguments)
     except Exception as e:
         return CallToolResult(
             content=[TextContent(type="text", text=f"Error: {str(e)}")], isError=True
@@ -178,15 +248,21 @@ async def handle_get_credit_quote(arguments: Dict[str, Any]) -> CallToolResult:
         quote = CreditPolicies.evaluate_credit_request(credit_request)
 
         # Generate quote ID
-        quote_id = f"quote_{actor_id}_{hash(str(credit_request))}"
+        quote_id = derive_quote_id(
+            credit_request.actor_id,
+            str(credit_request.amount),
+            credit_request.term_months,
+            credit_request.purpose,
+            credit_profile_data,
+        )
 
-        # Emit CloudEvent (optional)
+        # Queue CloudEvent emission (optional) so the tool call doesn't wait on it
         try:
-            await emit_credit_quote_event(
-                quote_id=quote_id, actor_id=actor_id, mandate=mandate, quote=quote
+            _event_queue.put_nowait(
+                {"quote_id": quote_id, "actor_id": actor_id, "mandate": mandate, "quote": quote}
             )
-        except Exception as e:
-            print(f"Warning: Failed to emit credit quote event: {e}")
+        except asyncio.QueueFull:
+            logger.warning("Event queue full, dropping credit quote event")
 
         # Format response
         result = {
@@ -202,11 +278,8 @@ async def handle_get_credit_quote(arguments: Dict[str, Any]) -> CallToolResult:
         }
 
         return CallToolResult(
-            content=[
-                TextContent(
-                    type="text", text=f"Credit Quote Result:\n{json.dumps(result, indent=2)}"
-                )
-            ]
+            content=[TextContent(type="text", text=f"Credit Quote Result:\n{_dumps(result)}")],
+            structuredContent=result,
         )
 
     except KeyError as e:
@@ -229,40 +302,12 @@ async def handle_get_bnpl_quote(arguments: Dict[str, Any]) -> CallToolResult:
         on_time_rate = arguments.get("on_time_rate", 0.0)
         utilization = arguments.get("utilization", 0.0)
 
-        # Validate and normalize features
-        features = validate_features(
-            {
-                "amount": amount,
-                "tenor": tenor,
-                "on_time_rate": on_time_rate,
-                "utilization": utilization,
-            }
-        )
-
-        # Score BNPL application
-        scoring_result = score_bnpl(features, random_state=42)
-
-        # Generate BNPL quote
-        quote = generate_bnpl_quote(
-            score=scoring_result["score"], amount=features["amount"], tenor=features["tenor"]
-        )
-
-        # Format response
-        result = {
-            "limit": quote["limit"],
-            "apr": quote["apr"],
-            "term_months": quote["term_months"],
-            "monthly_payment": quote["monthly_payment"],
-            "score": quote["score"],
-            "approved": quote["approved"],
-            "key_signals": scoring_result["key_signals"],
-            "components": scoring_result["components"],
-        }
+        # Validate, score and quote in one pass
+        result = compute_bnpl_response(amount, tenor, on_time_rate, utilization)
 
         return CallToolResult(
-            content=[
-                TextContent(type="text", text=f"BNPL Quote Result:\n{json.dumps(result, indent=2)}")
-            ]
+            content=[TextContent(type="text", text=f"BNPL Quote Result:\n{_dumps(result)}")],
+            structuredContent=result,
         )
 
     except KeyError as e:
@@ -276,17 +321,14 @@ async def handle_get_bnpl_quote(arguments: Dict[str, Any]) -> CallToolResult:
         )
 
 
-async def handle_list_policies() -> CallToolResult:
+async def handle_list_policies(arguments: Dict[str, Any]) -> CallToolResult:
     """Handle listPolicies tool call."""
     try:
-        policies = CreditPolicies.list_policies()
-
         return CallToolResult(
             content=[
-                TextContent(
-                    type="text", text=f"Current Credit Policies:\n{json.dumps(policies, indent=2)}"
-                )
-            ]
+                TextContent(type="text", text=f"Current Credit Policies:\n{_policies_text()}")
+            ],
+            structuredContent=CreditPolicies.list_policies(),
         )
 
     except Exception as e:
@@ -296,18 +338,18 @@ async def handle_list_policies() -> CallToolResult:
         )
 
 
+# Tool dispatch table; every handler takes the tool arguments and returns a result
+_TOOL_HANDLERS: Dict[str, Callable[[Dict[str, Any]], Awaitable[CallToolResult]]] = {
+    "getCreditQuote": handle_get_credit_quote,
+    "getBnplQuote": handle_get_bnpl_quote,
+    "listPolicies": handle_list_policies,
+}
+
+
 @server.list_resources()
 async def handle_list_resources() -> ListResourcesResult:
     """List available resources."""
-    resources = [
-        Resource(  # type: ignore
-            uri="okra://policies",  # type: ignore
-            name="Credit Policies",
-            description="Current credit policies and parameters",
-            mimeType="application/json",
-        )
-    ]
-    return ListResourcesResult(resources=resources)
+    return _LIST_RESOURCES_RESULT
 
 
 @server.read_resource()
@@ -315,8 +357,7 @@ async def handle_read_resource(uri: str) -> ReadResourceResult:
     """Read a resource."""
     if uri == "okra://policies":
         try:
-            policies = CreditPolicies.list_policies()
-            content = json.dumps(policies, indent=2)
+            content = _policies_text()
 
             return ReadResourceResult(contents=[TextContent(type="text", text=content)])  # type: ignore
         except Exception as e:
@@ -331,19 +372,25 @@ async def handle_read_resource(uri: str) -> ReadResourceResult:
 
 async def main():
     """Main MCP server loop."""
-    # Run server using stdio
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="okra-credit-agent",
-                server_version="0.1.0",
-                capabilities=server.get_capabilities(
-                    notification_options=NotificationOptions(), experimental_capabilities={}
+    worker = asyncio.create_task(_event_worker())
+    try:
+        # Run server using stdio
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name="okra-credit-agent",
+                    server_version="0.1.0",
+                    capabilities=server.get_capabilities(
+                        notification_options=NotificationOptions(), experimental_capabilities={}
+                    ),
                 ),
-            ),
-        )
+            )
+        # Flush events queued by the final tool calls
+        await _event_queue.join()
+    finally:
+        worker.cancel()
 
 
 if __name__ == "__main__":
@@ -2,15 +2,23 @@
 Deterministic policy rules for Okra credit decisions.
 """
 
+import math
+import sys
+from bisect import bisect_right
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
-from pydantic import BaseModel, Field
+import orjson
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class CreditProfile(BaseModel):
     """Credit profile information for policy evaluation."""
 
+    # Unknown keys are ignored: profiles come straight from API and MCP clients
+    model_config = ConfigDict(frozen=True)
+
     credit_score: Optional[int] = Field(None, ge=300, le=850, description="Credit score (300-850)")
     annual_income: Optional[Decimal] = Field(None, ge=0, description="Annual income in USD")
     debt_to_income_ratio: Optional[Decimal] = Field(None, ge=0, le=1, description="DTI ratio (0-1)")
@@ -23,6 +31,8 @@ class CreditProfile(BaseModel):
 class CreditRequest(BaseModel):
     """Credit request information."""
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     amount: Decimal = Field(..., gt=0, description="Requested credit amount")
     term_months: int = Field(..., ge=1, le=60, description="Loan term in months")
     purpose: str = Field(..., description="Loan purpose")
@@ -31,7 +41,15 @@ class CreditRequest(BaseModel):
 
 
 class CreditQuote(BaseModel):
-    """Credit quote response."""
+    """
+    Credit quote response.
+
+    CreditPolicies builds quotes with model_construct: every field is computed
+    from already-validated requests and policy constants, so field validation is
+    skipped on that path.
+    """
+
+    model_config = ConfigDict(frozen=True, extra="forbid")
 
     approved: bool = Field(..., description="Whether credit is approved")
     credit_limit: Decimal = Field(..., ge=0, description="Approved credit limit")
@@ -43,10 +61,41 @@ class CreditQuote(BaseModel):
     policy_version: str = Field("v1.0.0", description="Policy version used")
 
 
+# Distance (in cents) from a half cent below which float payments are recomputed exactly
+_HALF_CENT_TOLERANCE = 1e-6
+
+
+def _decimal_key(value: Optional[Decimal]) -> Optional[str]:
+    """Key an optional Decimal by its exact string form."""
+    return None if value is None else str(value)
+
+
+# Score-based decision classes, as stored in CreditPolicies._DECISION
+_DECLINE, _REVIEW, _AUTO_APPROVE = 0, 1, 2
+
+# Lowest valid credit score; decision table index 0
+_MIN_CREDIT_SCORE = 300
+_MAX_CREDIT_SCORE = 850
+
+
+def _decision_table(auto_approve: int, review: int) -> bytes:
+    """Map every valid credit score (offset by _MIN_CREDIT_SCORE) to its decision class."""
+    return bytes(
+        _AUTO_APPROVE if score >= auto_approve else _REVIEW if score >= review else _DECLINE
+        for score in range(_MIN_CREDIT_SCORE, _MAX_CREDIT_SCORE + 1)
+    )
+
+
 class CreditPolicies:
     """Deterministic credit policies for Okra."""
 
-    # Policy thresholds
+    POLICY_VERSION = sys.intern("v1.0.0")
+
+    # Policy thresholds. These, RATE_TIERS and the factors below are frozen at
+    # class creation: _DECISION, the tier tuples, the reason templates and the
+    # _evaluate_cached memo (keyed on POLICY_VERSION, not on the values) are all
+    # derived from them. Change a threshold only together with POLICY_VERSION,
+    # in source, never by assigning to the class at runtime.
     MIN_CREDIT_SCORE_AUTO_APPROVE = 720
     MIN_CREDIT_SCORE_REVIEW = 650
     MAX_DTI_RATIO = Decimal("0.45")
@@ -54,6 +103,20 @@ class CreditPolicies:
     MAX_LOAN_AMOUNT = Decimal("50000")
     MIN_LOAN_AMOUNT = Decimal("1000")
 
+    # Decline reason templates with the thresholds pre-formatted
+    _MSG_AMOUNT_BELOW_MIN = f"Requested amount ${{}} below minimum ${MIN_LOAN_AMOUNT}"
+    _MSG_AMOUNT_ABOVE_MAX = f"Requested amount ${{}} exceeds maximum ${MAX_LOAN_AMOUNT}"
+    _MSG_INCOME_BELOW_MIN = f"Income ${{}} below minimum ${MIN_ANNUAL_INCOME}"
+    _MSG_DTI_ABOVE_MAX = f"DTI ratio {{:.2%}} exceeds maximum {MAX_DTI_RATIO:.2%}"
+    _MSG_SCORE_BELOW_MIN = "Credit score {} below minimum threshold"
+    _MSG_AUTO_APPROVED = "Excellent credit score {} - auto-approved"
+    _MSG_APPROVED_TERMS = "Approved for ${} at {}% APR"
+    _MSG_REVIEW_REQUIRED = "Good credit score {} - review required"
+
+    # Fixed reasons, interned so every quote that carries one shares a single string
+    _MSG_NO_PROFILE = sys.intern("No credit profile provided - manual review required")
+    _MSG_NO_CREDIT_SCORE = sys.intern("No credit score provided - manual review required")
+
     # Rate tiers
     RATE_TIERS = [
         (720, Decimal("8.99")),  # Excellent credit
@@ -63,106 +126,187 @@ class CreditPolicies:
         (0, Decimal("29.99")),  # Subprime
     ]
 
+    # Credit limit and rounding factors
+    _INCOME_FACTOR = Decimal("0.30")  # Max limit as a share of annual income
+    _LIMIT_GOOD = Decimal("0.90")
+    _LIMIT_FAIR = Decimal("0.80")
+    _LIMIT_POOR = Decimal("0.70")
+    _REVIEW_LIMIT_FACTOR = Decimal("0.80")  # Review estimates cap at 80% of max loan
+    _CENTS = Decimal("0.01")
+    _ZERO = Decimal("0")
+
+    # Decision class per credit score, indexed by score - 300
+    _DECISION = _decision_table(MIN_CREDIT_SCORE_AUTO_APPROVE, MIN_CREDIT_SCORE_REVIEW)
+
+    # RATE_TIERS in ascending score order, for bisect lookups
+    _TIER_SCORES = tuple(score for score, _ in reversed(RATE_TIERS))
+    _TIER_APRS = tuple(apr for _, apr in reversed(RATE_TIERS))
+
     @classmethod
     def evaluate_credit_request(cls, request: CreditRequest) -> CreditQuote:
         """
         Evaluate a credit request using deterministic policy rules.
 
+        Quotes depend only on the amount, the term and the profile fields the
+        rules read, so evaluations are memoized on those per policy version.
+        Decimals are keyed by their string form, since reasons quote them
+        verbatim (Decimal("500") == Decimal("500.00") but prints differently).
+
         Args:
             request: Credit request information
 
         Returns:
             Credit quote with approval decision and terms
         """
-        reasons = []
-        approved = False
-        review_required = False
+        profile = request.profile
+        quote = cls._evaluate_cached(
+            cls.POLICY_VERSION,
+            str(request.amount),
+            request.term_months,
+            (
+                None
+                if profile is None
+                else (
+                    profile.credit_score,
+                    _decimal_key(profile.annual_income),
+                    _decimal_key(profile.debt_to_income_ratio),
+                )
+            ),
+        )
+        # Callers get their own reasons list rather than the cached one
+        return quote.model_copy(update={"reasons": list(quote.reasons)})
+
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def _evaluate_cached(
+        cls,
+        version: str,
+        amount: str,
+        term_months: int,
+        profile: Optional[Tuple[Optional[int], Optional[str], Optional[str]]],
+    ) -> CreditQuote:
+        """
+        Evaluate a request rebuilt from its cache key.
 
+        The key carries the policy version but none of the thresholds or rate
+        tiers: those are frozen at import, and runtime changes to them are not
+        seen by cached quotes.
+        """
+        profile_model = None
+        if profile is not None:
+            credit_score, annual_income, debt_to_income_ratio = profile
+            profile_model = CreditProfile.model_construct(
+                credit_score=credit_score,
+                annual_income=None if annual_income is None else Decimal(annual_income),
+                debt_to_income_ratio=(
+                    None if debt_to_income_ratio is None else Decimal(debt_to_income_ratio)
+                ),
+            )
+        request = CreditRequest.model_construct(
+            amount=Decimal(amount),
+            term_months=term_months,
+            purpose="",
+            actor_id="",
+            profile=profile_model,
+        )
+        return cls._evaluate(request)
+
+    @classmethod
+    def _evaluate(cls, request: CreditRequest) -> CreditQuote:
+        """Apply the policy rules to a credit request."""
         # Basic amount validation
         if request.amount < cls.MIN_LOAN_AMOUNT:
-            reasons.append(
-                f"Requested amount ${request.amount} below minimum ${cls.MIN_LOAN_AMOUNT}"
+            return cls._create_declined_quote(
+                request,
+                [cls._MSG_AMOUNT_BELOW_MIN.format(request.amount)],
             )
-            return cls._create_declined_quote(request, reasons)
 
         if request.amount > cls.MAX_LOAN_AMOUNT:
-            reasons.append(
-                f"Requested amount ${request.amount} exceeds maximum ${cls.MAX_LOAN_AMOUNT}"
+            return cls._create_declined_quote(
+                request,
+                [cls._MSG_AMOUNT_ABOVE_MAX.format(request.amount)],
             )
-            return cls._create_declined_quote(request, reasons)
 
         # If no profile provided, require review
         if not request.profile:
-            review_required = True
-            reasons.append("No credit profile provided - manual review required")
-            return cls._create_review_quote(request, reasons)
+            return cls._create_review_quote(request, [cls._MSG_NO_PROFILE])
 
         profile = request.profile
 
         # Check minimum income
         if profile.annual_income and profile.annual_income < cls.MIN_ANNUAL_INCOME:
-            reasons.append(
-                f"Income ${profile.annual_income} below minimum ${cls.MIN_ANNUAL_INCOME}"
+            return cls._create_declined_quote(
+                request,
+                [cls._MSG_INCOME_BELOW_MIN.format(profile.annual_income)],
             )
-            return cls._create_declined_quote(request, reasons)
 
         # Check debt-to-income ratio
         if profile.debt_to_income_ratio and profile.debt_to_income_ratio > cls.MAX_DTI_RATIO:
-            reasons.append(
-                f"DTI ratio {profile.debt_to_income_ratio:.2%} exceeds maximum {cls.MAX_DTI_RATIO:.2%}"
+            return cls._create_declined_quote(
+                request,
+                [cls._MSG_DTI_ABOVE_MAX.format(profile.debt_to_income_ratio)],
             )
-            return cls._create_declined_quote(request, reasons)
 
         # Check credit score
         if not profile.credit_score:
-            review_required = True
-            reasons.append("No credit score provided - manual review required")
-            return cls._create_review_quote(request, reasons)
+            return cls._create_review_quote(request, [cls._MSG_NO_CREDIT_SCORE])
 
         credit_score = profile.credit_score
-
-        # Auto-approve for excellent credit
-        if credit_score >= cls.MIN_CREDIT_SCORE_AUTO_APPROVE:
-            approved = True
-            reasons.append(f"Excellent credit score {credit_score} - auto-approved")
-        elif credit_score >= cls.MIN_CREDIT_SCORE_REVIEW:
-            review_required = True
-            reasons.append(f"Good credit score {credit_score} - review required")
-        else:
-            reasons.append(f"Credit score {credit_score} below minimum threshold")
-            return cls._create_declined_quote(request, reasons)
+        # Clamp into the table: profiles built without validation may carry any
+        # score, and the thresholds all sit inside 300-850
+        decision = cls._DECISION[
+            min(max(credit_score, _MIN_CREDIT_SCORE), _MAX_CREDIT_SCORE) - _MIN_CREDIT_SCORE
+        ]
+
+        # Decline below the review threshold before computing any terms
+        if decision == _DECLINE:
+            return cls._create_declined_quote(
+                request, [cls._MSG_SCORE_BELOW_MIN.format(credit_score)]
+            )
 
         # Calculate terms
         apr = cls._get_apr_for_score(credit_score)
         credit_limit = cls._calculate_credit_limit(request.amount, profile)
 
         # Calculate monthly payment
-        monthly_rate = apr / 100 / 12
+        monthly_rate = cls._monthly_rate(apr)
         monthly_payment = cls._calculate_monthly_payment(
             credit_limit, monthly_rate, request.term_months
         )
 
+        # Auto-approve for excellent credit, otherwise require review
+        approved = decision == _AUTO_APPROVE
         if approved:
-            reasons.append(f"Approved for ${credit_limit} at {apr}% APR")
+            reasons = [
+                cls._MSG_AUTO_APPROVED.format(credit_score),
+                cls._MSG_APPROVED_TERMS.format(credit_limit, apr),
+            ]
+        else:
+            reasons = [cls._MSG_REVIEW_REQUIRED.format(credit_score)]
 
-        return CreditQuote(
+        return CreditQuote.model_construct(
             approved=approved,
             credit_limit=credit_limit,
             apr=apr,
             term_months=request.term_months,
             monthly_payment=monthly_payment,
             reasons=reasons,
-            review_required=review_required,
-            policy_version="v1.0.0",
+            review_required=not approved,
+            policy_version=cls.POLICY_VERSION,
         )
 
     @classmethod
+    @lru_cache(maxsize=551)  # One entry per valid credit score (300-850)
     def _get_apr_for_score(cls, credit_score: int) -> Decimal:
         """Get APR based on credit score."""
-        for min_score, apr in cls.RATE_TIERS:
-            if credit_score >= min_score:
-                return apr
-        return cls.RATE_TIERS[-1][1]  # Default to highest rate
+        # Scores below every tier fall back to the highest rate
+        return cls._TIER_APRS[max(bisect_right(cls._TIER_SCORES, credit_score) - 1, 0)]
+
+    @classmethod
+    @lru_cache(maxsize=8)  # APRs only ever come from RATE_TIERS
+    def _monthly_rate(cls, apr: Decimal) -> Decimal:
+        """Convert an APR percentage into the exact monthly interest rate."""
+        return apr / 100 / 12
 
     @classmethod
     def _calculate_credit_limit(cls, requested_amount: Decimal, profile: CreditProfile) -> Decimal:
@@ -172,7 +316,7 @@ class CreditPolicies:
 
         # Adjust based on income (max 30% of annual income)
         if profile.annual_income:
-            max_by_income = profile.annual_income * Decimal("0.30")
+            max_by_income = profile.annual_income * cls._INCOME_FACTOR
             limit = min(limit, max_by_income)
 
         # Adjust based on credit score
@@ -182,18 +326,18 @@ class CreditPolicies:
                 pass
             elif profile.credit_score >= 700:
                 # Good credit - reduce by 10%
-                limit = limit * Decimal("0.90")
+                limit = limit * cls._LIMIT_GOOD
             elif profile.credit_score >= 650:
                 # Fair credit - reduce by 20%
-                limit = limit * Decimal("0.80")
+                limit = limit * cls._LIMIT_FAIR
             else:
                 # Poor credit - reduce by 30%
-                limit = limit * Decimal("0.70")
+                limit = limit * cls._LIMIT_POOR
 
         # Ensure minimum of $1000
         limit = max(limit, cls.MIN_LOAN_AMOUNT)
 
-        return limit.quantize(Decimal("0.01"))
+        return limit.quantize(cls._CENTS)
 
     @classmethod
     def _calculate_monthly_payment(
@@ -203,26 +347,36 @@ class CreditPolicies:
         if monthly_rate == 0:
             return principal / months
 
-        # Standard loan payment formula
-        payment = (
-            principal
-            * (monthly_rate * (1 + monthly_rate) ** months)
-            / ((1 + monthly_rate) ** months - 1)
-        )
-        return payment.quantize(Decimal("0.01"))
+        # Standard loan payment formula, in float: only the cent-rounded result matters
+        rate = float(monthly_rate)
+        growth = math.pow(1.0 + rate, months)
+        payment = float(principal) * rate * growth / (growth - 1.0)
+
+        # Within float error of a half cent the rounding direction is ambiguous,
+        # so settle it with exact Decimal arithmetic
+        cents = payment * 100.0
+        if abs(cents - math.floor(cents) - 0.5) < _HALF_CENT_TOLERANCE:
+            exact = (
+                principal
+                * (monthly_rate * (1 + monthly_rate) ** months)
+                / ((1 + monthly_rate) ** months - 1)
+            )
+            return exact.quantize(cls._CENTS)
+
+        return Decimal(f"{payment:.2f}")
 
     @classmethod
     def _create_declined_quote(cls, request: CreditRequest, reasons: List[str]) -> CreditQuote:
         """Create a declined credit quote."""
-        return CreditQuote(
+        return CreditQuote.model_construct(
             approved=False,
-            credit_limit=Decimal("0"),
-            apr=Decimal("0"),
+            credit_limit=cls._ZERO,
+            apr=cls._ZERO,
             term_months=request.term_months,
-            monthly_payment=Decimal("0"),
+            monthly_payment=cls._ZERO,
             reasons=reasons,
             review_required=False,
-            policy_version="v1.0.0",
+            policy_version=cls.POLICY_VERSION,
         )
 
     @classmethod
@@ -230,13 +384,13 @@ class CreditPolicies:
         """Create a quote requiring manual review."""
         # Provide estimated terms for review
         apr = cls.RATE_TIERS[1][1]  # Use "good" rate as estimate
-        credit_limit = min(request.amount, cls.MAX_LOAN_AMOUNT * Decimal("0.80"))
-        monthly_rate = apr / 100 / 12
+        credit_limit = min(request.amount, cls.MAX_LOAN_AMOUNT * cls._REVIEW_LIMIT_FACTOR)
+        monthly_rate = cls._monthly_rate(apr)
         monthly_payment = cls._calculate_monthly_payment(
             credit_limit, monthly_rate, request.term_months
         )
 
-        return CreditQuote(
+        return CreditQuote.model_construct(
             approved=False,
             credit_limit=credit_limit,
             apr=apr,
@@ -244,14 +398,48 @@ class CreditPolicies:
             monthly_payment=monthly_payment,
             reasons=reasons,
             review_required=True,
-            policy_version="v1.0.0",
+            policy_version=cls.POLICY_VERSION,
         )
 
     @classmethod
     def list_policies(cls) -> Dict[str, Any]:
-        """List current policy parameters."""
+        """
+        List current policy parameters.
+
+        Each call returns a fresh dict, decoded from the cached JSON listing,
+        so callers may modify it; serving paths should use list_policies_json.
+        """
+        return orjson.loads(cls.list_policies_json())
+
+    @classmethod
+    def list_policies_json(cls, *, indent: bool = False) -> bytes:
+        """
+        Serialize the current policy listing as JSON.
+
+        Like the listing itself, the bytes are built once per policy version.
+
+        Args:
+            indent: Indent with two spaces, for human-readable output
+
+        Returns:
+            JSON-encoded list_policies() result
+        """
+        return cls._policy_listing_json(cls.POLICY_VERSION, indent)
+
+    @classmethod
+    @lru_cache(maxsize=2)  # Compact and indented forms of the current version
+    def _policy_listing_json(cls, version: str, indent: bool) -> bytes:
+        """Serialize the policy listing for a policy version (cached per version and form)."""
+        return orjson.dumps(
+            cls._policy_listing(version), option=orjson.OPT_INDENT_2 if indent else None
+        )
+
+    @classmethod
+    @lru_cache(maxsize=1)
+    def _policy_listing(cls, version: str) -> Dict[str, Any]:
+        """Build the policy listing for a policy version (cached per version)."""
         return {
-            "policy_version": "v1.0.0",
+            "policy_version": version,
             "thresholds": {
                 "min_credit_score_auto_approve": cls.MIN_CREDIT_SCORE_AUTO_APPROVE,
                 "min_credit_score_review": cls.MIN_CREDIT_SCORE_REVIEW,
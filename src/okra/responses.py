@@ -0,0 +1,38 @@
+"""
+Response classes for the Okra FastAPI service.
+"""
+
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse, Response
+
+
+def _default(obj: Any) -> Any:
+    """Serialize types orjson does not handle natively."""
+    if isinstance(obj, Decimal):
+        # Keep the exact decimal representation rather than rounding to a float
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson instead of the stdlib encoder."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class PrerenderedJSONResponse(Response):
+    """
+    JSON response for a body serialized ahead of time.
+
+    The bytes are sent as-is; only the media type is fixed, so callers need
+    not repeat it.
+    """
+
+    media_type = "application/json"
+
+    def __init__(self, body: bytes) -> None:
+        super().__init__(content=body)
@@ -0,0 +1,18 @@
+"""
+Shared fixtures for the BNPL API tests.
+"""
+
+from typing import AsyncIterator
+
+import httpx
+import pytest
+
+from okra.api import app
+
+
+@pytest.fixture(scope="session")
+async def async_client() -> AsyncIterator[httpx.AsyncClient]:
+    """Create one in-process async client calling the ASGI app directly."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as c:
+        yield c
@@ -4,63 +4,73 @@ Tests for BNPL API quote endpoints.
 
 from typing import Any, Dict
 
+import httpx
+import orjson
 import pytest
-from fastapi.testclient import TestClient
+from fastapi.routing import APIRoute
 
 from okra.api import app
 
-
-@pytest.fixture
-def client() -> TestClient:
-    """Create test client."""
-    return TestClient(app)
+pytestmark = pytest.mark.anyio
+
+# Valid BNPL quote request, serialized once for every test that posts it as-is
+_VALID_BNPL_REQUEST: Dict[str, Any] = {
+    "amount": 1500.0,
+    "tenor": 6,
+    "on_time_rate": 0.95,
+    "utilization": 0.3,
+}
+_VALID_BNPL_BODY: bytes = orjson.dumps(_VALID_BNPL_REQUEST)
+_JSON_HEADERS = {"content-type": "application/json"}
+
+# JSON numbers decode as int or float
+_NUM = (int, float)
+_REQUIRED_FIELDS = (
+    "limit",
+    "apr",
+    "term_months",
+    "monthly_payment",
+    "score",
+    "approved",
+    "key_signals",
+    "components",
+)
 
 
 @pytest.fixture
-def valid_bnpl_request() -> Dict[str, Any]:
-    """Valid BNPL quote request."""
-    return {"amount": 1500.0, "tenor": 6, "on_time_rate": 0.95, "utilization": 0.3}
+def valid_body() -> bytes:
+    """Valid BNPL quote request as JSON bytes."""
+    return _VALID_BNPL_BODY
 
 
-def test_bnpl_quote_endpoint_success(
-    client: TestClient, valid_bnpl_request: Dict[str, Any]
+async def test_bnpl_quote_endpoint_success(
+    async_client: httpx.AsyncClient, valid_body: bytes
 ) -> None:
     """Test successful BNPL quote request."""
-    response = client.post("/bnpl/quote", json=valid_bnpl_request)
+    response = await async_client.post("/bnpl/quote", content=valid_body, headers=_JSON_HEADERS)
 
     assert response.status_code == 200
 
     data = response.json()
 
     # Check required fields
-    required_fields = [
-        "limit",
-        "apr",
-        "term_months",
-        "monthly_payment",
-        "score",
-        "approved",
-        "key_signals",
-        "components",
-    ]
-
-    for field in required_fields:
+    for field in _REQUIRED_FIELDS:
         assert field in data
 
     # Validate data types and ranges
-    assert isinstance(data["limit"], (int, float))
+    assert isinstance(data["limit"], _NUM)
     assert data["limit"] > 0
 
-    assert isinstance(data["apr"], (int, float))
+    assert isinstance(data["apr"], _NUM)
     assert data["apr"] >= 15.0  # Minimum base APR
 
     assert isinstance(data["term_months"], int)
     assert 1 <= data["term_months"] <= 12
 
-    assert isinstance(data["monthly_payment"], (int, float))
+    assert isinstance(data["monthly_payment"], _NUM)
     assert data["monthly_payment"] > 0
 
-    assert isinstance(data["score"], (int, float))
+    assert isinstance(data["score"], _NUM)
     assert 0.0 <= data["score"] <= 1.0
 
     assert isinstance(data["approved"], bool)
@@ -69,14 +79,14 @@ def test_bnpl_quote_endpoint_success(
     assert isinstance(data["components"], dict)
 
 
-def test_bnpl_quote_endpoint_deterministic(
-    client: TestClient, valid_bnpl_request: Dict[str, Any]
+async def test_bnpl_quote_endpoint_deterministic(
+    async_client: httpx.AsyncClient, valid_body: bytes
 ) -> None:
     """Test that BNPL quotes are deterministic."""
     # Make multiple requests with same parameters
     responses = []
     for _ in range(3):
-        response = client.post("/bnpl/quote", json=valid_bnpl_request)
+        response = await async_client.post("/bnpl/quote", content=valid_body, headers=_JSON_HEADERS)
         assert response.status_code == 200
         responses.append(response.json())
 
@@ -91,11 +101,13 @@ def test_bnpl_quote_endpoint_deterministic(
         assert response["approved"] == first_response["approved"]
 
 
-def test_bnpl_quote_endpoint_with_ce(
-    client: TestClient, valid_bnpl_request: Dict[str, Any]
+async def test_bnpl_quote_endpoint_with_ce(
+    async_client: httpx.AsyncClient, valid_body: bytes
 ) -> None:
     """Test BNPL quote with CloudEvent emission."""
-    response = client.post("/bnpl/quote?emit_ce=true", json=valid_bnpl_request)
+    response = await async_client.post(
+        "/bnpl/quote?emit_ce=true", content=valid_body, headers=_JSON_HEADERS
+    )
 
     assert response.status_code == 200
 
@@ -124,7 +136,70 @@ def test_bnpl_quote_endpoint_with_ce(
     assert "metadata" in ce_data
 
 
-def test_bnpl_quote_endpoint_validation_amount_too_low(client: TestClient) -> None:
+async def test_bnpl_quote_batch_endpoint_matches_single(
+    async_client: httpx.AsyncClient, valid_body: bytes
+) -> None:
+    """Test that batch quotes match single quotes, in request order."""
+    other_request = {"amount": 300.0, "tenor": 12, "on_time_rate": 0.5, "utilization": 0.9}
+
+    response = await async_client.post(
+        "/bnpl/quote/batch", json=[_VALID_BNPL_REQUEST, other_request]
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data == [
+        (await async_client.post("/bnpl/quote", content=valid_body, headers=_JSON_HEADERS)).json(),
+        (await async_client.post("/bnpl/quote", json=other_request)).json(),
+    ]
+
+
+async def test_bnpl_quote_batch_endpoint_with_ce(async_client: httpx.AsyncClient) -> None:
+    """Test batch BNPL quotes with CloudEvent emission."""
+    response = await async_client.post(
+        "/bnpl/quote/batch?emit_ce=true", json=[_VALID_BNPL_REQUEST] * 2
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 2
+
+    for item in data:
+        assert item["cloud_event"]["type"] == "ocn.okra.bnpl_quote.v1"
+        assert item["cloud_event"]["subject"] == item["trace_id"]
+
+    assert data[0]["trace_id"] != data[1]["trace_id"]
+
+
+async def test_bnpl_quote_batch_endpoint_compresses_large_responses(
+    async_client: httpx.AsyncClient,
+) -> None:
+    """Test that large batch responses are gzipped and small bodies are not."""
+    response = await async_client.post(
+        "/bnpl/quote/batch", json=[_VALID_BNPL_REQUEST] * 5, headers={"accept-encoding": "gzip"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()) == 5
+
+    response = await async_client.get("/health", headers={"accept-encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+async def test_bnpl_quote_batch_endpoint_validation(async_client: httpx.AsyncClient) -> None:
+    """Test batch validation for empty batches and invalid items."""
+    assert (await async_client.post("/bnpl/quote/batch", json=[])).status_code == 422
+
+    response = await async_client.post(
+        "/bnpl/quote/batch", json=[_VALID_BNPL_REQUEST, {**_VALID_BNPL_REQUEST, "tenor": 24}]
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", 1, "tenor"]
+
+
+async def test_bnpl_quote_endpoint_validation_amount_too_low(
+    async_client: httpx.AsyncClient,
+) -> None:
     """Test validation for amount below minimum."""
     request = {
         "amount": 50.0,  # Below minimum
@@ -133,11 +208,13 @@ def test_bnpl_quote_endpoint_validation_amount_too_low(client: TestClient) -> No
         "utilization": 0.3,
     }
 
-    response = client.post("/bnpl/quote", json=request)
+    response = await async_client.post("/bnpl/quote", json=request)
     assert response.status_code == 422  # Validation error
 
 
-def test_bnpl_quote_endpoint_validation_amount_too_high(client: TestClient) -> None:
+async def test_bnpl_quote_endpoint_validation_amount_too_high(
+    async_client: httpx.AsyncClient,
+) -> None:
     """Test validation for amount above maximum."""
     request = {
         "amount": 10000.0,  # Above maximum
@@ -146,11 +223,13 @@ def test_bnpl_quote_endpoint_validation_amount_too_high(client: TestClient) -> N
         "utilization": 0.3,
     }
 
-    response = client.post("/bnpl/quote", json=request)
+    response = await async_client.post("/bnpl/quote", json=request)
     assert response.status_code == 422  # Validation error
 
 
-def test_bnpl_quote_endpoint_validation_tenor_too_low(client: TestClient) -> None:
+async def test_bnpl_quote_endpoint_validation_tenor_too_low(
+    async_client: httpx.AsyncClient,
+) -> None:
     """Test validation for tenor below minimum."""
     request = {
         "amount": 1500.0,
@@ -159,11 +238,13 @@ def test_bnpl_quote_endpoint_validation_tenor_too_low(client: TestClient) -> Non
         "utilization": 0.3,
     }
 
-    response = client.post("/bnpl/quote", json=request)
+    response = await async_client.post("/bnpl/quote", json=request)
     assert response.status_code == 422  # Validation error
 
 
-def test_bnpl_quote_endpoint_validation_tenor_too_high(client: TestClient) -> None:
+async def test_bnpl_quote_endpoint_validation_tenor_too_high(
+    async_client: httpx.AsyncClient,
+) -> None:
     """Test validation for tenor above maximum."""
     request = {
         "amount": 1500.0,
@@ -172,11 +253,13 @@ def test_bnpl_quote_endpoint_validation_tenor_too_high(client: TestClient) -> No
         "utilization": 0.3,
     }
 
-    response = client.post("/bnpl/quote", json=request)
+    response = await async_client.post("/bnpl/quote", json=request)
     assert response.status_code == 422  # Validation error
 
 
-def test_bnpl_quote_endpoint_validation_on_time_rate_out_of_range(client: TestClient) -> None:
+async def test_bnpl_quote_endpoint_validation_on_time_rate_out_of_range(
+    async_client: httpx.AsyncClient,
+) -> None:
     """Test validation for on_time_rate out of range."""
     request = {
         "amount": 1500.0,
@@ -185,11 +268,13 @@ def test_bnpl_quote_endpoint_validation_on_time_rate_out_of_range(client: TestCl
         "utilization": 0.3,
     }
 
-    response = client.post("/bnpl/quote", json=request)
+    response = await async_client.post("/bnpl/quote", json=request)
     assert response.status_code == 422  # Validation error
 
 
-def test_bnpl_quote_endpoint_validation_utilization_out_of_range(client: TestClient) -> None:
+async def test_bnpl_quote_endpoint_validation_utilization_out_of_range(
+    async_client: httpx.AsyncClient,
+) -> None:
     """Test validation for utilization out of range."""
     request = {
         "amount": 1500.0,
@@ -198,26 +283,28 @@ def test_bnpl_quote_endpoint_validation_utilization_out_of_range(client: TestCli
         "utilization": -0.1,  # Below minimum
     }
 
-    response = client.post("/bnpl/quote", json=request)
+    response = await async_client.post("/bnpl/quote", json=request)
     assert response.status_code == 422  # Validation error
 
 
-def test_bnpl_quote_endpoint_missing_required_fields(client: TestClient) -> None:
+async def test_bnpl_quote_endpoint_missing_required_fields(async_client: httpx.AsyncClient) -> None:
     """Test validation for missing required fields."""
     # Missing amount
     request = {"tenor": 6, "on_time_rate": 0.95, "utilization": 0.3}
 
-    response = client.post("/bnpl/quote", json=request)
+    response = await async_client.post("/bnpl/quote", json=request)
     assert response.status_code == 422  # Validation error
 
     # Missing tenor
     request = {"amount": 1500.0, "on_time_rate": 0.95, "utilization": 0.3}
 
-    response = client.post("/bnpl/quote", json=request)
+    response = await async_client.post("/bnpl/quote", json=request)
     assert response.status_code == 422  # Validation error
 
 
-def test_bnpl_quote_endpoint_optional_fields_defaults(client: TestClient) -> None:
+async def test_bnpl_quote_endpoint_optional_fields_defaults(
+    async_client: httpx.AsyncClient,
+) -> None:
     """Test that optional fields use default values."""
     request = {
         "amount": 1500.0,
@@ -225,7 +312,7 @@ def test_bnpl_quote_endpoint_optional_fields_defaults(client: TestClient) -> Non
         # on_time_rate and utilization should default to 0.0
     }
 
-    response = client.post("/bnpl/quote", json=request)
+    response = await async_client.post("/bnpl/quote", json=request)
     assert response.status_code == 200
 
     data = response.json()
@@ -236,11 +323,11 @@ def test_bnpl_quote_endpoint_optional_fields_defaults(client: TestClient) -> Non
     assert data["apr"] >= 15.0
 
 
-def test_bnpl_quote_endpoint_key_signals_structure(
-    client: TestClient, valid_bnpl_request: Dict[str, Any]
+async def test_bnpl_quote_endpoint_key_signals_structure(
+    async_client: httpx.AsyncClient, valid_body: bytes
 ) -> None:
     """Test that key_signals have expected structure."""
-    response = client.post("/bnpl/quote", json=valid_bnpl_request)
+    response = await async_client.post("/bnpl/quote", content=valid_body, headers=_JSON_HEADERS)
     assert response.status_code == 200
 
     data = response.json()
@@ -261,11 +348,11 @@ def test_bnpl_quote_endpoint_key_signals_structure(
         assert key_signals[signal]  # Not empty
 
 
-def test_bnpl_quote_endpoint_components_structure(
-    client: TestClient, valid_bnpl_request: Dict[str, Any]
+async def test_bnpl_quote_endpoint_components_structure(
+    async_client: httpx.AsyncClient, valid_body: bytes
 ) -> None:
     """Test that components have expected structure."""
-    response = client.post("/bnpl/quote", json=valid_bnpl_request)
+    response = await async_client.post("/bnpl/quote", content=valid_body, headers=_JSON_HEADERS)
     assert response.status_code == 200
 
     data = response.json()
@@ -276,45 +363,48 @@ def test_bnpl_quote_endpoint_components_structure(
 
     for component in required_components:
         assert component in components
-        assert isinstance(components[component], (int, float))
+        assert isinstance(components[component], _NUM)
         assert 0.0 <= components[component] <= 1.0
 
 
-def test_bnpl_quote_endpoint_response_shape_consistency(client: TestClient) -> None:
-    """Test that response shape is consistent across different inputs."""
-    test_cases = [
+@pytest.mark.parametrize(
+    "test_case",
+    [
         {"amount": 500.0, "tenor": 3, "on_time_rate": 0.8, "utilization": 0.5},
         {"amount": 2000.0, "tenor": 9, "on_time_rate": 0.99, "utilization": 0.1},
         {"amount": 3500.0, "tenor": 12, "on_time_rate": 0.7, "utilization": 0.8},
-    ]
+    ],
+)
+async def test_bnpl_quote_endpoint_response_shape_consistency(
+    async_client: httpx.AsyncClient, test_case: Dict[str, Any]
+) -> None:
+    """Test that response shape is consistent across different inputs."""
+    response = await async_client.post("/bnpl/quote", json=test_case)
+    assert response.status_code == 200
 
-    for test_case in test_cases:
-        response = client.post("/bnpl/quote", json=test_case)
-        assert response.status_code == 200
+    data = response.json()
+
+    # All responses should have same structure
+    assert all(field in data for field in _REQUIRED_FIELDS)
+
+    # All responses should have valid data types
+    assert isinstance(data["limit"], _NUM)
+    assert isinstance(data["apr"], _NUM)
+    assert isinstance(data["term_months"], int)
+    assert isinstance(data["monthly_payment"], _NUM)
+    assert isinstance(data["score"], _NUM)
+    assert isinstance(data["approved"], bool)
+    assert isinstance(data["key_signals"], dict)
+    assert isinstance(data["components"], dict)
+
+
+async def test_bnpl_quote_endpoints_document_response_without_validating(
+    async_client: httpx.AsyncClient,
+) -> None:
+    """Test that BNPL responses are documented in OpenAPI but not re-validated at runtime."""
+    routes = {route.path: route for route in app.routes if isinstance(route, APIRoute)}
+    schema = (await async_client.get("/openapi.json")).json()
 
-        data = response.json()
-
-        # All responses should have same structure
-        assert all(
-            field in data
-            for field in [
-                "limit",
-                "apr",
-                "term_months",
-                "monthly_payment",
-                "score",
-                "approved",
-                "key_signals",
-                "components",
-            ]
-        )
-
-        # All responses should have valid data types
-        assert isinstance(data["limit"], (int, float))
-        assert isinstance(data["apr"], (int, float))
-        assert isinstance(data["term_months"], int)
-        assert isinstance(data["monthly_payment"], (int, float))
-        assert isinstance(data["score"], (int, float))
-        assert isinstance(data["approved"], bool)
-        assert isinstance(data["key_signals"], dict)
-        assert isinstance(data["components"], dict)
+    for path in ("/bnpl/quote", "/bnpl/quote/batch"):
+        assert routes[path].response_model is None
+        assert "BNPLQuoteResponse" in str(schema["paths"][path]["post"]["responses"]["200"])
@@ -4,16 +4,48 @@ Tests for BNPL CloudEvents functionality.
 
 import json
 import uuid
-
+from typing import Any, Dict
 
 from okra.ce import (
     emit_bnpl_quote_ce,
+    emit_bnpl_quote_ce_batch,
     validate_ce_schema,
     create_bnpl_quote_payload,
+    get_event_time,
     get_trace_id,
     format_ce_for_logging,
 )
 
+# Shared, read-only test inputs: tests that need a variation build a new dict
+# rather than mutating these
+_QUOTE = {
+    "limit": 1200.0,
+    "apr": 18.5,
+    "term_months": 6,
+    "monthly_payment": 200.0,
+    "score": 0.75,
+    "approved": True,
+}
+_QUOTE_WITHOUT_APPROVED = {key: value for key, value in _QUOTE.items() if key != "approved"}
+_FEATURES = {"amount": 1500.0, "tenor": 6}
+_SIGNALS = {"risk_signal": "low_risk"}
+_PAYLOAD = {"quote": _QUOTE, "features": _FEATURES, "key_signals": _SIGNALS}
+
+_FULL_FEATURES = {"amount": 1500.0, "tenor": 6, "on_time_rate": 0.95, "utilization": 0.3}
+_FULL_SIGNALS = {
+    "amount_signal": "moderate_amount",
+    "tenor_signal": "medium_term",
+    "payment_signal": "excellent_history",
+    "utilization_signal": "low_utilization",
+    "risk_signal": "low_risk",
+}
+
+_MINIMAL_PAYLOAD: Dict[str, Any] = {
+    "quote": {"score": 0.5, "approved": True},
+    "features": {"amount": 1000.0},
+    "key_signals": {"risk_signal": "medium_risk"},
+}
+
 
 def test_get_trace_id_generates_uuid() -> None:
     """Test that get_trace_id generates a valid UUID."""
@@ -23,28 +55,26 @@ def test_get_trace_id_generates_uuid() -> None:
     assert uuid.UUID(trace_id, version=4)
 
 
+def test_get_trace_id_is_canonical_rfc4122_v4() -> None:
+    """Test that trace IDs carry the v4 version and RFC 4122 variant bits."""
+    for _ in range(100):
+        trace_id = get_trace_id()
+        parsed = uuid.UUID(trace_id)
+        assert str(parsed) == trace_id
+        assert parsed.version == 4
+        assert parsed.variant == uuid.RFC_4122
+
+
+def test_get_trace_id_unique_across_pool_refills() -> None:
+    """Test that trace IDs stay unique when the random pool is refilled."""
+    trace_ids = [get_trace_id() for _ in range(1000)]  # Several pool refills
+
+    assert len(set(trace_ids)) == len(trace_ids)
+
+
 def test_create_bnpl_quote_payload_structure() -> None:
     """Test that create_bnpl_quote_payload returns the correct structure."""
-    quote = {
-        "limit": 1200.0,
-        "apr": 18.5,
-        "term_months": 6,
-        "monthly_payment": 200.0,
-        "score": 0.75,
-        "approved": True,
-    }
-
-    features = {"amount": 1500.0, "tenor": 6, "on_time_rate": 0.95, "utilization": 0.3}
-
-    key_signals = {
-        "amount_signal": "moderate_amount",
-        "tenor_signal": "medium_term",
-        "payment_signal": "excellent_history",
-        "utilization_signal": "low_utilization",
-        "risk_signal": "low_risk",
-    }
-
-    payload = create_bnpl_quote_payload(quote, features, key_signals)
+    payload = create_bnpl_quote_payload(_QUOTE, _FULL_FEATURES, _FULL_SIGNALS)
 
     assert "quote" in payload
     assert "features" in payload
@@ -52,30 +82,45 @@ def test_create_bnpl_quote_payload_structure() -> None:
     assert "timestamp" in payload
     assert "metadata" in payload
 
-    assert payload["quote"] == quote
-    assert payload["features"] == features
-    assert payload["key_signals"] == key_signals
+    assert payload["quote"] == _QUOTE
+    assert payload["features"] == _FULL_FEATURES
+    assert payload["key_signals"] == _FULL_SIGNALS
 
     assert "service" in payload["metadata"]
     assert payload["metadata"]["service"] == "okra"
     assert payload["metadata"]["feature"] == "bnpl_scoring"
 
 
+def test_create_bnpl_quote_payload_metadata_is_per_payload() -> None:
+    """Test that enriching one event's metadata leaves later payloads untouched."""
+    event = emit_bnpl_quote_ce(get_trace_id(), create_bnpl_quote_payload(_QUOTE, {}, {}))
+    event["data"]["metadata"]["region"] = "us-east-1"
+
+    payload = create_bnpl_quote_payload(_QUOTE, {}, {})
+    assert payload["metadata"] == {"service": "okra", "version": "1.0.0", "feature": "bnpl_scoring"}
+
+
+def test_create_bnpl_quote_payload_timestamp_is_iso_string() -> None:
+    """Test that the payload timestamp survives a JSON round-trip unchanged."""
+    payload = create_bnpl_quote_payload(_MINIMAL_PAYLOAD["quote"], {}, {})
+
+    assert isinstance(payload["timestamp"], str)
+    assert json.loads(json.dumps(payload)) == payload
+
+
+def test_event_time_shared_by_payload_and_event() -> None:
+    """Test that one clock reading can timestamp both the payload and the event."""
+    now = get_event_time()
+    payload = create_bnpl_quote_payload(_MINIMAL_PAYLOAD["quote"], {}, {}, now=now)
+    event = emit_bnpl_quote_ce(get_trace_id(), payload, now=now)
+
+    assert payload["timestamp"] == event["time"] == now
+
+
 def test_emit_bnpl_quote_ce_structure() -> None:
     """Test that emit_bnpl_quote_ce creates a valid CloudEvent structure."""
     trace_id = get_trace_id()
-    payload = {
-        "quote": {
-            "limit": 1200.0,
-            "apr": 18.5,
-            "term_months": 6,
-            "monthly_payment": 200.0,
-            "score": 0.75,
-            "approved": True,
-        },
-        "features": {"amount": 1500.0, "tenor": 6},
-        "key_signals": {"risk_signal": "low_risk"},
-    }
+    payload = _PAYLOAD
 
     event = emit_bnpl_quote_ce(trace_id, payload)
 
@@ -99,18 +144,7 @@ def test_emit_bnpl_quote_ce_structure() -> None:
 def test_validate_ce_schema_valid_event() -> None:
     """Test validate_ce_schema with a valid CloudEvent."""
     trace_id = get_trace_id()
-    payload = create_bnpl_quote_payload(
-        quote={
-            "limit": 1200.0,
-            "apr": 18.5,
-            "term_months": 6,
-            "monthly_payment": 200.0,
-            "score": 0.75,
-            "approved": True,
-        },
-        features={"amount": 1500.0, "tenor": 6},
-        key_signals={"risk_signal": "low_risk"},
-    )
+    payload = create_bnpl_quote_payload(_QUOTE, _FEATURES, _SIGNALS)
 
     event = emit_bnpl_quote_ce(trace_id, payload)
     assert validate_ce_schema(event) is True
@@ -119,18 +153,7 @@ def test_validate_ce_schema_valid_event() -> None:
 def test_validate_ce_schema_invalid_event_missing_field() -> None:
     """Test validate_ce_schema with a CloudEvent missing a required field."""
     trace_id = get_trace_id()
-    payload = create_bnpl_quote_payload(
-        quote={
-            "limit": 1200.0,
-            "apr": 18.5,
-            "term_months": 6,
-            "monthly_payment": 200.0,
-            "score": 0.75,
-            "approved": True,
-        },
-        features={"amount": 1500.0, "tenor": 6},
-        key_signals={"risk_signal": "low_risk"},
-    )
+    payload = create_bnpl_quote_payload(_QUOTE, _FEATURES, _SIGNALS)
 
     event = emit_bnpl_quote_ce(trace_id, payload)
     del event["type"]  # Remove a required field
@@ -140,18 +163,7 @@ def test_validate_ce_schema_invalid_event_missing_field() -> None:
 def test_validate_ce_schema_invalid_event_wrong_type() -> None:
     """Test validate_ce_schema with a CloudEvent having wrong type."""
     trace_id = get_trace_id()
-    payload = create_bnpl_quote_payload(
-        quote={
-            "limit": 1200.0,
-            "apr": 18.5,
-            "term_months": 6,
-            "monthly_payment": 200.0,
-            "score": 0.75,
-            "approved": True,
-        },
-        features={"amount": 1500.0, "tenor": 6},
-        key_signals={"risk_signal": "low_risk"},
-    )
+    payload = create_bnpl_quote_payload(_QUOTE, _FEATURES, _SIGNALS)
 
     event = emit_bnpl_quote_ce(trace_id, payload)
     event["type"] = "ocn.orca.decision.v1"  # Wrong type
@@ -161,18 +173,7 @@ def test_validate_ce_schema_invalid_event_wrong_type() -> None:
 def test_validate_ce_schema_invalid_event_wrong_source() -> None:
     """Test validate_ce_schema with a CloudEvent having wrong source."""
     trace_id = get_trace_id()
-    payload = create_bnpl_quote_payload(
-        quote={
-            "limit": 1200.0,
-            "apr": 18.5,
-            "term_months": 6,
-            "monthly_payment": 200.0,
-            "score": 0.75,
-            "approved": True,
-        },
-        features={"amount": 1500.0, "tenor": 6},
-        key_signals={"risk_signal": "low_risk"},
-    )
+    payload = create_bnpl_quote_payload(_QUOTE, _FEATURES, _SIGNALS)
 
     event = emit_bnpl_quote_ce(trace_id, payload)
     event["source"] = "orion"  # Wrong source
@@ -182,18 +183,7 @@ def test_validate_ce_schema_invalid_event_wrong_source() -> None:
 def test_validate_ce_schema_invalid_data_missing_quote_field() -> None:
     """Test validate_ce_schema with data missing a required quote field."""
     trace_id = get_trace_id()
-    payload = create_bnpl_quote_payload(
-        quote={
-            "limit": 1200.0,
-            "apr": 18.5,
-            "term_months": 6,
-            "monthly_payment": 200.0,
-            "score": 0.75,
-            # "approved": True  # Missing field
-        },
-        features={"amount": 1500.0, "tenor": 6},
-        key_signals={"risk_signal": "low_risk"},
-    )
+    payload = create_bnpl_quote_payload(_QUOTE_WITHOUT_APPROVED, _FEATURES, _SIGNALS)
 
     event = emit_bnpl_quote_ce(trace_id, payload)
     assert validate_ce_schema(event) is False
@@ -202,38 +192,25 @@ def test_validate_ce_schema_invalid_data_missing_quote_field() -> None:
 def test_validate_ce_schema_invalid_data_wrong_score_type() -> None:
     """Test validate_ce_schema with data having wrong score type."""
     trace_id = get_trace_id()
-    payload = create_bnpl_quote_payload(
-        quote={
-            "limit": 1200.0,
-            "apr": 18.5,
-            "term_months": 6,
-            "monthly_payment": 200.0,
-            "score": "not_a_number",  # Wrong type
-            "approved": True,
-        },
-        features={"amount": 1500.0, "tenor": 6},
-        key_signals={"risk_signal": "low_risk"},
-    )
+    payload = create_bnpl_quote_payload({**_QUOTE, "score": "not_a_number"}, _FEATURES, _SIGNALS)
 
     event = emit_bnpl_quote_ce(trace_id, payload)
     assert validate_ce_schema(event) is False
 
 
+def test_validate_ce_schema_accepts_bool_score() -> None:
+    """Test that a bool score passes, since bool is an int subclass."""
+    payload = create_bnpl_quote_payload({**_QUOTE, "score": True}, _FEATURES, _SIGNALS)
+
+    event = emit_bnpl_quote_ce(get_trace_id(), payload)
+    assert validate_ce_schema(event) is True
+    assert validate_ce_schema(json.dumps(event).encode()) is True
+
+
 def test_validate_ce_schema_invalid_data_score_out_of_range() -> None:
     """Test validate_ce_schema with data having score out of range."""
     trace_id = get_trace_id()
-    payload = create_bnpl_quote_payload(
-        quote={
-            "limit": 1200.0,
-            "apr": 18.5,
-            "term_months": 6,
-            "monthly_payment": 200.0,
-            "score": 1.5,  # Out of range
-            "approved": True,
-        },
-        features={"amount": 1500.0, "tenor": 6},
-        key_signals={"risk_signal": "low_risk"},
-    )
+    payload = create_bnpl_quote_payload({**_QUOTE, "score": 1.5}, _FEATURES, _SIGNALS)
 
     event = emit_bnpl_quote_ce(trace_id, payload)
     assert validate_ce_schema(event) is False
@@ -242,18 +219,7 @@ def test_validate_ce_schema_invalid_data_score_out_of_range() -> None:
 def test_validate_ce_schema_invalid_data_wrong_approved_type() -> None:
     """Test validate_ce_schema with data having wrong approved type."""
     trace_id = get_trace_id()
-    payload = create_bnpl_quote_payload(
-        quote={
-            "limit": 1200.0,
-            "apr": 18.5,
-            "term_months": 6,
-            "monthly_payment": 200.0,
-            "score": 0.75,
-            "approved": "yes",  # Wrong type
-        },
-        features={"amount": 1500.0, "tenor": 6},
-        key_signals={"risk_signal": "low_risk"},
-    )
+    payload = create_bnpl_quote_payload({**_QUOTE, "approved": "yes"}, _FEATURES, _SIGNALS)
 
     event = emit_bnpl_quote_ce(trace_id, payload)
     assert validate_ce_schema(event) is False
@@ -262,18 +228,7 @@ def test_validate_ce_schema_invalid_data_wrong_approved_type() -> None:
 def test_format_ce_for_logging() -> None:
     """Test that CloudEvent is formatted correctly for logging."""
     trace_id = "test-trace-123"
-    payload = create_bnpl_quote_payload(
-        quote={
-            "limit": 1200.0,
-            "apr": 18.5,
-            "term_months": 6,
-            "monthly_payment": 200.0,
-            "score": 0.75,
-            "approved": True,
-        },
-        features={"amount": 1500.0, "tenor": 6},
-        key_signals={"risk_signal": "low_risk"},
-    )
+    payload = create_bnpl_quote_payload(_QUOTE, _FEATURES, _SIGNALS)
 
     event = emit_bnpl_quote_ce(trace_id, payload)
     formatted = format_ce_for_logging(event)
@@ -292,26 +247,7 @@ def test_format_ce_for_logging() -> None:
 def test_end_to_end_ce_validation() -> None:
     """Test end-to-end CloudEvent creation and validation."""
     # Create BNPL quote payload
-    quote = {
-        "limit": 1200.0,
-        "apr": 18.5,
-        "term_months": 6,
-        "monthly_payment": 200.0,
-        "score": 0.75,
-        "approved": True,
-    }
-
-    features = {"amount": 1500.0, "tenor": 6, "on_time_rate": 0.95, "utilization": 0.3}
-
-    key_signals = {
-        "amount_signal": "moderate_amount",
-        "tenor_signal": "medium_term",
-        "payment_signal": "excellent_history",
-        "utilization_signal": "low_utilization",
-        "risk_signal": "low_risk",
-    }
-
-    payload = create_bnpl_quote_payload(quote, features, key_signals)
+    payload = create_bnpl_quote_payload(_QUOTE, _FULL_FEATURES, _FULL_SIGNALS)
 
     # Emit CloudEvent
     trace_id = get_trace_id()
@@ -332,11 +268,7 @@ def test_end_to_end_ce_validation() -> None:
 def test_ce_event_id_uniqueness() -> None:
     """Test that CloudEvent IDs are unique."""
     trace_id = get_trace_id()
-    payload = {
-        "quote": {"score": 0.5, "approved": True},
-        "features": {"amount": 1000.0},
-        "key_signals": {"risk_signal": "medium_risk"},
-    }
+    payload = _MINIMAL_PAYLOAD
 
     # Generate multiple events
     events = []
@@ -353,14 +285,25 @@ def test_ce_event_id_uniqueness() -> None:
         assert uuid.UUID(event_id, version=4)
 
 
+def test_emit_bnpl_quote_ce_batch() -> None:
+    """Test that batch emission produces one valid event per item, in order."""
+    payload = _PAYLOAD
+    trace_ids = [get_trace_id() for _ in range(3)]
+
+    events = emit_bnpl_quote_ce_batch([(trace_id, payload) for trace_id in trace_ids])
+
+    assert [event["subject"] for event in events] == trace_ids
+    assert len({event["id"] for event in events}) == len(events)
+    assert all(validate_ce_schema(event) for event in events)
+
+    # The whole batch serializes in one call
+    assert json.loads(json.dumps(events)) == events
+
+
 def test_ce_event_timestamp_format() -> None:
     """Test that CloudEvent timestamps are in correct ISO format."""
     trace_id = get_trace_id()
-    payload = {
-        "quote": {"score": 0.5, "approved": True},
-        "features": {"amount": 1000.0},
-        "key_signals": {"risk_signal": "medium_risk"},
-    }
+    payload = _MINIMAL_PAYLOAD
 
     event = emit_bnpl_quote_ce(trace_id, payload)
 
@@ -374,3 +317,12 @@ def test_ce_event_timestamp_format() -> None:
     now = datetime.datetime.now(datetime.timezone.utc)
     time_diff = abs((now - timestamp).total_seconds())
     assert time_diff < 60  # Within 1 minute
+
+
+def test_validate_ce_schema_accepts_raw_json_bytes() -> None:
+    """Test validate_ce_schema on a serialized CloudEvent."""
+    payload = create_bnpl_quote_payload(_QUOTE, _FEATURES, _SIGNALS)
+
+    event = emit_bnpl_quote_ce(get_trace_id(), payload)
+    assert validate_ce_schema(json.dumps(event).encode()) is True
+    assert validate_ce_schema(b"not json") is False
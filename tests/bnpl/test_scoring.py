@@ -2,7 +2,17 @@
 Tests for BNPL scoring functionality.
 """
 
-from okra.bnpl import score_bnpl, generate_bnpl_quote, validate_features
+from typing import Any, Dict, List
+
+from okra.bnpl import (
+    _generate_key_signals,
+    _score_components,
+    compute_bnpl_response,
+    generate_bnpl_quote,
+    score_bnpl,
+    score_bnpl_batch,
+    validate_features,
+)
 
 
 def test_score_bnpl_deterministic() -> None:
@@ -109,6 +119,12 @@ def test_score_bnpl_utilization_signals() -> None:
     assert high_result["key_signals"]["utilization_signal"] == "high_utilization"
 
 
+def test_key_signals_label_any_tenor() -> None:
+    """Test that tenors outside the scoring range still get the nearest band."""
+    assert _generate_key_signals(1500.0, 0, 0.9, 0.2, 0.7)["tenor_signal"] == "short_term"
+    assert _generate_key_signals(1500.0, 24, 0.9, 0.2, 0.7)["tenor_signal"] == "long_term"
+
+
 def test_score_bnpl_risk_signals() -> None:
     """Test risk signals based on total score."""
     # High score (low risk)
@@ -208,3 +224,126 @@ def test_score_bnpl_different_random_states() -> None:
     # Note: In this implementation, random state doesn't affect deterministic scoring
     # but the function signature supports it for future enhancements
     assert isinstance(result3["score"], (int, float))
+
+
+def test_score_bnpl_matches_uncached_near_band_edges() -> None:
+    """Test that memoized scoring matches a direct computation just off each band edge."""
+    for amount, on_time_rate, utilization in [
+        (3000.004, 0.94996, 0.30004),
+        (499.996, 0.85045, 0.79996),
+        (1500.0, 0.000434, 0.5),
+        (2550.00001, 0.69999, 0.30000001),
+    ]:
+        result = score_bnpl(
+            {"amount": amount, "tenor": 6, "on_time_rate": on_time_rate, "utilization": utilization}
+        )
+
+        total, *components = _score_components(amount, 6, on_time_rate, utilization)
+        assert result["score"] == round(total, 3)
+        assert list(result["components"].values()) == [round(c, 3) for c in components]
+        assert result["key_signals"] == _generate_key_signals(
+            amount, 6, on_time_rate, utilization, total
+        )
+
+
+def test_score_bnpl_keeps_exact_inputs() -> None:
+    """Test that inputs are not rounded before scoring (values from the unmemoized scorer)."""
+    base = {"amount": 1500.0, "tenor": 6, "on_time_rate": 0.9, "utilization": 0.2}
+
+    result = score_bnpl({**base, "on_time_rate": 0.94996})
+    assert result["key_signals"]["payment_signal"] == "good_history"
+
+    result = score_bnpl({**base, "utilization": 0.30004})
+    assert result["key_signals"]["utilization_signal"] == "moderate_utilization"
+
+    result = score_bnpl({**base, "amount": 3000.004})
+    assert result["key_signals"]["amount_signal"] == "high_amount"
+
+    result = score_bnpl({**base, "on_time_rate": 0.85045})
+    assert result["components"]["on_time_score"] == 0.85
+
+    result = score_bnpl({**base, "on_time_rate": 0.000434, "utilization": 0.5})
+    assert result["score"] == 0.418
+
+
+def test_score_bnpl_batch_matches_scalar() -> None:
+    """Test that batch scoring matches scoring each row individually."""
+    batch = [
+        {"amount": 1500.0, "tenor": 6, "on_time_rate": 0.95, "utilization": 0.3},
+        {"amount": 300.0, "tenor": 12, "on_time_rate": 0.5, "utilization": 0.9},
+        {"amount": 1500.0, "tenor": 6, "on_time_rate": 0.95, "utilization": 0.3},
+    ]
+
+    results = score_bnpl_batch(batch)
+
+    assert len(results) == len(batch)
+    for features, result in zip(batch, results):
+        assert result == score_bnpl(features)
+
+    # Rows must not share mutable state
+    assert results[0] is not results[2]
+    assert results[0]["key_signals"] is not results[2]["key_signals"]
+
+
+def test_score_bnpl_batch_accepts_columns() -> None:
+    """Test that columnar batches score the same as row batches."""
+    rows = [
+        {"amount": 1500.0, "tenor": 6, "on_time_rate": 0.95, "utilization": 0.3},
+        {"amount": 300.0, "tenor": 12, "on_time_rate": 0.5, "utilization": 0.9},
+    ]
+    columns = {name: [row[name] for row in rows] for name in rows[0]}
+
+    assert score_bnpl_batch(columns) == score_bnpl_batch(rows)
+
+    # Missing columns fall back to the scalar defaults
+    assert score_bnpl_batch({"amount": [1500.0]}) == [score_bnpl({"amount": 1500.0})]
+
+
+def test_compute_bnpl_response_matches_pipeline() -> None:
+    """Test that the fused pipeline matches validate, score and quote run separately."""
+    raws: List[Dict[str, Any]] = [
+        {"amount": 1500.0, "tenor": 6, "on_time_rate": 0.95, "utilization": 0.3},
+        {"amount": 50.0, "tenor": 15, "on_time_rate": 1.5, "utilization": -0.1},
+        {"amount": 3000.004, "tenor": 9, "on_time_rate": 0.85, "utilization": 0.30001},
+    ]
+    for raw in raws:
+        features = validate_features(raw)
+        scoring_result = score_bnpl(features)
+        quote = generate_bnpl_quote(
+            score=scoring_result["score"], amount=features["amount"], tenor=features["tenor"]
+        )
+
+        assert compute_bnpl_response(**raw) == {
+            **quote,
+            "key_signals": scoring_result["key_signals"],
+            "components": scoring_result["components"],
+        }
+
+
+def test_compute_bnpl_response_keeps_exact_inputs() -> None:
+    """Test the fused pipeline against values from the unmemoized scorer near band edges."""
+    assert compute_bnpl_response(3000.004, 9, 0.85, 0.30004) == {
+        "limit": 2547.0,
+        "apr": 18.02,
+        "term_months": 10,
+        "monthly_payment": 254.7,
+        "score": 0.698,
+        "approved": True,
+        "key_signals": {
+            "amount_signal": "high_amount",
+            "tenor_signal": "long_term",
+            "payment_signal": "good_history",
+            "utilization_signal": "moderate_utilization",
+            "risk_signal": "medium_risk",
+        },
+        "components": {
+            "amount_score": 0.908,
+            "tenor_score": 0.38,
+            "on_time_score": 0.85,
+            "utilization_score": 0.7,
+        },
+    }
+
+    result = compute_bnpl_response(1500.0, 6, 0.94996, 0.2)
+    assert result["key_signals"]["payment_signal"] == "good_history"
+    assert result["score"] == 0.795
@@ -0,0 +1,23 @@
+"""
+Shared pytest fixtures.
+"""
+
+from typing import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from okra.api import app
+
+
+@pytest.fixture(scope="session")
+def client() -> Iterator[TestClient]:
+    """Create one test client (and run the app lifespan once) for the whole session."""
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
+def anyio_backend() -> str:
+    """Run anyio-marked tests (and session-scoped async fixtures) on asyncio."""
+    return "asyncio"
@@ -2,19 +2,19 @@
 Tests for FastAPI service.
 """
 
-import pytest
-from fastapi.testclient import TestClient
-
-from okra.api import app
+import json
+from decimal import Decimal
 
+import orjson
+import pytest
 
-@pytest.fixture
-def client():
-    """Create test client."""
-    return TestClient(app)
+from okra.api import CreditQuoteResponse
+from okra.policies import CreditPolicies
+from okra.responses import ORJSONResponse, PrerenderedJSONResponse
 
 
-@pytest.fixture
+# Pure data fixtures: built once per module and never mutated by the tests
+@pytest.fixture(scope="module")
 def sample_mandate():
     """Sample AP2 mandate for testing."""
     return {
@@ -47,7 +47,7 @@ def sample_mandate():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_credit_profile():
     """Sample credit profile for testing."""
     return {
@@ -59,6 +59,28 @@ def sample_credit_profile():
     }
 
 
+_JSON_HEADERS = {"content-type": "application/json"}
+
+
+@pytest.fixture(scope="module")
+def approved_quote_body(sample_mandate, sample_credit_profile):
+    """Approved-case credit quote request, encoded once per module."""
+    return orjson.dumps(
+        {
+            "mandate": sample_mandate,
+            "credit_profile": sample_credit_profile,
+            "requested_amount": 15000,
+            "term_months": 36,
+            "purpose": "home_improvement",
+        }
+    )
+
+
+def _post_quote(client, request_data):
+    """POST a credit quote request, encoding the body with orjson."""
+    return client.post("/credit/quote", content=orjson.dumps(request_data), headers=_JSON_HEADERS)
+
+
 class TestRootEndpoints:
     """Test root endpoints."""
 
@@ -92,21 +114,21 @@ class TestRootEndpoints:
         assert "thresholds" in data
         assert "rate_tiers" in data
 
+    def test_get_policies_tracks_policy_version(self, client, monkeypatch):
+        """Test that the cached policies body is rebuilt when the version changes."""
+        monkeypatch.setattr(CreditPolicies, "POLICY_VERSION", "v9.9.9")
+
+        response = client.get("/policies")
+        assert response.status_code == 200
+        assert response.json()["policy_version"] == "v9.9.9"
+
 
 class TestCreditQuote:
     """Test credit quote endpoint."""
 
-    def test_credit_quote_approved(self, client, sample_mandate, sample_credit_profile):
+    def test_credit_quote_approved(self, client, approved_quote_body):
         """Test credit quote for approved case."""
-        request_data = {
-            "mandate": sample_mandate,
-            "credit_profile": sample_credit_profile,
-            "requested_amount": 15000,
-            "term_months": 36,
-            "purpose": "home_improvement",
-        }
-
-        response = client.post("/credit/quote", json=request_data)
+        response = client.post("/credit/quote", content=approved_quote_body, headers=_JSON_HEADERS)
         assert response.status_code == 200
 
         data = response.json()
@@ -120,6 +142,25 @@ class TestCreditQuote:
         assert data["review_required"] is False
         assert data["policy_version"] == "v1.0.0"
 
+    def test_credit_quote_matches_response_schema(
+        self, client, sample_mandate, sample_credit_profile
+    ):
+        """Test that the hand-built response body has exactly the documented shape."""
+        request_data = {
+            "mandate": sample_mandate,
+            "credit_profile": sample_credit_profile,
+            "requested_amount": 15000,
+            "term_months": 36,
+        }
+
+        response = _post_quote(client, request_data)
+        assert response.status_code == 200
+
+        # The body skips response-model validation, so check it against the model here
+        data = response.json()
+        assert list(data) == list(CreditQuoteResponse.model_fields)
+        assert CreditQuoteResponse.model_validate(data, strict=True).model_dump() == data
+
     def test_credit_quote_review_required(self, client, sample_mandate):
         """Test credit quote for review required case."""
         credit_profile = {
@@ -136,7 +177,7 @@ class TestCreditQuote:
             "purpose": "debt_consolidation",
         }
 
-        response = client.post("/credit/quote", json=request_data)
+        response = _post_quote(client, request_data)
         assert response.status_code == 200
 
         data = response.json()
@@ -163,7 +204,7 @@ class TestCreditQuote:
             "purpose": "emergency",
         }
 
-        response = client.post("/credit/quote", json=request_data)
+        response = _post_quote(client, request_data)
         assert response.status_code == 200
 
         data = response.json()
@@ -183,7 +224,7 @@ class TestCreditQuote:
             "purpose": "general",
         }
 
-        response = client.post("/credit/quote", json=request_data)
+        response = _post_quote(client, request_data)
         assert response.status_code == 200
 
         data = response.json()
@@ -202,7 +243,7 @@ class TestCreditQuote:
             "purpose": "test",
         }
 
-        response = client.post("/credit/quote", json=request_data)
+        response = _post_quote(client, request_data)
         assert response.status_code == 422  # Validation error
 
     def test_credit_quote_invalid_term(self, client, sample_mandate, sample_credit_profile):
@@ -215,7 +256,7 @@ class TestCreditQuote:
             "purpose": "test",
         }
 
-        response = client.post("/credit/quote", json=request_data)
+        response = _post_quote(client, request_data)
         assert response.status_code == 422  # Validation error
 
     def test_credit_quote_missing_mandate(self, client, sample_credit_profile):
@@ -227,7 +268,7 @@ class TestCreditQuote:
             "purpose": "test",
         }
 
-        response = client.post("/credit/quote", json=request_data)
+        response = _post_quote(client, request_data)
         assert response.status_code == 422  # Validation error
 
 
@@ -244,19 +285,11 @@ class TestQuoteRetrieval:
 class TestDeterministicResults:
     """Test that results are deterministic."""
 
-    def test_deterministic_quote_id(self, client, sample_mandate, sample_credit_profile):
+    def test_deterministic_quote_id(self, client, approved_quote_body):
         """Test that same inputs produce same quote ID."""
-        request_data = {
-            "mandate": sample_mandate,
-            "credit_profile": sample_credit_profile,
-            "requested_amount": 15000,
-            "term_months": 36,
-            "purpose": "home_improvement",
-        }
-
         # Make two identical requests
-        response1 = client.post("/credit/quote", json=request_data)
-        response2 = client.post("/credit/quote", json=request_data)
+        response1 = client.post("/credit/quote", content=approved_quote_body, headers=_JSON_HEADERS)
+        response2 = client.post("/credit/quote", content=approved_quote_body, headers=_JSON_HEADERS)
 
         assert response1.status_code == 200
         assert response2.status_code == 200
@@ -295,8 +328,8 @@ class TestDeterministicResults:
             "purpose": "test1",
         }
 
-        response1 = client.post("/credit/quote", json=request1)
-        response2 = client.post("/credit/quote", json=request2)
+        response1 = _post_quote(client, request1)
+        response2 = _post_quote(client, request2)
 
         assert response1.status_code == 200
         assert response2.status_code == 200
@@ -309,3 +342,66 @@ class TestDeterministicResults:
 
         # Credit limits should be different
         assert data1["credit_limit"] != data2["credit_limit"]
+
+    def test_different_profiles_different_quote_ids(
+        self, client, sample_mandate, sample_credit_profile
+    ):
+        """Test that the credit profile contributes to the quote ID."""
+        request_data = {
+            "mandate": sample_mandate,
+            "credit_profile": sample_credit_profile,
+            "requested_amount": 15000,
+            "term_months": 36,
+            "purpose": "home_improvement",
+        }
+        other_profile = {**sample_credit_profile, "credit_score": 690}
+
+        response1 = _post_quote(client, request_data)
+        response2 = _post_quote(client, {**request_data, "credit_profile": other_profile})
+
+        assert response1.json()["quote_id"] != response2.json()["quote_id"]
+        assert response1.json()["quote_id"].startswith("quote_user_12345_")
+
+    def test_quote_id_accepts_profiles_orjson_cannot_encode(
+        self, client, sample_mandate, sample_credit_profile
+    ):
+        """Test that extra profile values beyond orjson's range still hash to a quote ID."""
+        request_data = {
+            "mandate": sample_mandate,
+            "credit_profile": {**sample_credit_profile, "ref": 123456789012345678901234567890},
+            "requested_amount": 15000,
+            "term_months": 36,
+        }
+        body = json.dumps(request_data)  # orjson cannot encode the big integer either
+
+        response1 = client.post("/credit/quote", content=body, headers=_JSON_HEADERS)
+        response2 = client.post("/credit/quote", content=body, headers=_JSON_HEADERS)
+
+        assert response1.status_code == 200
+        assert response1.json()["quote_id"] == response2.json()["quote_id"]
+
+
+class TestResponseRendering:
+    """Test JSON response rendering."""
+
+    def test_orjson_response_renders_decimal_as_string(self):
+        """Test that Decimal values keep their exact representation."""
+        response = ORJSONResponse({"apr": Decimal("8.50"), "limit": 25000.0})
+
+        assert json.loads(response.body) == {"apr": "8.50", "limit": 25000.0}
+
+    def test_orjson_response_rejects_unknown_types(self):
+        """Test that unsupported values still fail loudly."""
+        with pytest.raises(TypeError):
+            ORJSONResponse({"value": object()})
+
+    def test_prerendered_response_matches_rendered_response(self, client):
+        """Test that a prerendered body goes out exactly as ORJSONResponse would send it."""
+        rendered = ORJSONResponse({"status": "healthy"})
+        response = PrerenderedJSONResponse(orjson.dumps({"status": "healthy"}))
+
+        assert response.body == rendered.body
+        assert response.headers == rendered.headers
+
+        health = client.get("/health")
+        assert health.headers["content-length"] == str(len(health.content))
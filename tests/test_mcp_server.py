@@ -0,0 +1,29 @@
+"""
+Tests for the stdio MCP server tool handlers.
+"""
+
+import json
+
+import pytest
+
+# The handlers build results with the MCP SDK; skip when it is missing or its
+# API no longer matches the server module
+server = pytest.importorskip("okra.mcp.server")
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_credit_quote_id_accepts_profiles_orjson_cannot_encode() -> None:
+    """Test that the quote tool hashes profiles with values beyond orjson's range."""
+    arguments = {
+        "mandate": {"actor": {"id": "user_123"}, "cart": {}, "payment": {}},
+        "credit_profile": {"credit_score": 750, "ref": 123456789012345678901234567890},
+        "requested_amount": 15000,
+        "term_months": 36,
+    }
+
+    result = await server.handle_get_credit_quote(arguments)
+
+    header, _, body = result.content[0].text.partition("\n")
+    assert header == "Credit Quote Result:"
+    assert json.loads(body)["quote_id"].startswith("quote_user_123_")
@@ -1,12 +1,8 @@
 import pytest
-import sys
-import os
-
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 from fastapi.testclient import TestClient
 from fastapi import FastAPI
-from mcp.server import router as mcp_router
+from okra.mcp.router import router as mcp_router
 
 
 # Create a test FastAPI app and include the MCP router
@@ -46,6 +42,34 @@ def test_mcp_get_credit_quote(client):
     assert "description" in data["data"]
 
 
+def test_mcp_stub_verbs_serve_precomputed_bodies(client):
+    """Test that the deterministic verbs return the same full JSON body on every call."""
+    expected = {
+        "getStatus": {"ok": True, "data": {"agent": "okra", "status": "active"}},
+        "getCreditQuote": {
+            "ok": True,
+            "data": {
+                "agent": "okra",
+                "quote_id": "quote_stub_12345",
+                "approved": True,
+                "credit_limit": 25000.0,
+                "apr": 8.5,
+                "term_months": 12,
+                "monthly_payment": 2196.75,
+                "reasons": ["Good credit profile", "Low debt-to-income ratio"],
+                "review_required": False,
+                "policy_version": "v1.0",
+                "description": "Deterministic stub credit quote for testing",
+            },
+        },
+    }
+    for verb, body in expected.items():
+        for _ in range(2):
+            response = client.post("/mcp/invoke", json={"verb": verb, "args": {}})
+            assert response.headers["content-type"] == "application/json"
+            assert response.json() == body
+
+
 def test_mcp_unsupported_verb(client):
     """Test MCP with unsupported verb returns error."""
     response = client.post("/mcp/invoke", json={"verb": "unsupportedVerb", "args": {}})
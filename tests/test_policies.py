@@ -2,6 +2,7 @@
 Tests for credit policies.
 """
 
+import json
 import pytest
 from decimal import Decimal
 
@@ -86,6 +87,24 @@ class TestCreditRequest:
                 actor_id="user_123",
             )
 
+    def test_request_is_immutable(self):
+        """Test that requests are frozen and reject unknown fields."""
+        request = CreditRequest(
+            amount=Decimal("10000"), term_months=12, purpose="test", actor_id="user_123"
+        )
+
+        with pytest.raises(ValueError):
+            request.amount = Decimal("20000")
+
+        with pytest.raises(ValueError):
+            CreditRequest(
+                amount=Decimal("10000"),
+                term_months=12,
+                purpose="test",
+                actor_id="user_123",
+                channel="web",  # Unknown field
+            )
+
 
 class TestCreditPolicies:
     """Test credit policy evaluation."""
@@ -267,10 +286,9 @@ class TestCreditPolicies:
         assert quote.review_required is True
         assert "manual review required" in " ".join(quote.reasons)
 
-    def test_rate_tiers(self):
-        """Test APR assignment based on credit score."""
-        # Test different credit scores
-        test_cases = [
+    @pytest.mark.parametrize(
+        "credit_score,expected_apr",
+        [
             (800, Decimal("8.99")),  # Excellent
             (720, Decimal("8.99")),  # Excellent
             (700, Decimal("12.99")),  # Good
@@ -278,30 +296,90 @@ class TestCreditPolicies:
             (650, Decimal("18.99")),  # Fair
             (620, Decimal("24.99")),  # Poor
             (580, Decimal("29.99")),  # Subprime
-        ]
+        ],
+    )
+    def test_rate_tiers(self, credit_score, expected_apr):
+        """Test APR assignment based on credit score."""
+        profile = CreditProfile(
+            credit_score=credit_score,
+            annual_income=Decimal("100000"),
+            debt_to_income_ratio=Decimal("0.25"),
+        )
+
+        request = CreditRequest(
+            amount=Decimal("10000"),
+            term_months=24,
+            purpose="test",
+            actor_id="user_123",
+            profile=profile,
+        )
 
-        for credit_score, expected_apr in test_cases:
-            profile = CreditProfile(
-                credit_score=credit_score,
-                annual_income=Decimal("100000"),
-                debt_to_income_ratio=Decimal("0.25"),
+        quote = CreditPolicies.evaluate_credit_request(request)
+
+        # For approved quotes, check APR
+        if quote.approved or quote.review_required:
+            assert (
+                quote.apr == expected_apr
+            ), f"Credit score {credit_score} should get APR {expected_apr}, got {quote.apr}"
+
+    def test_rate_tier_lookup_covers_every_score(self):
+        """Test the APR lookup against a linear scan of RATE_TIERS for every valid score."""
+        for credit_score in range(300, 851):
+            expected_apr = next(
+                apr for min_score, apr in CreditPolicies.RATE_TIERS if credit_score >= min_score
+            )
+            assert CreditPolicies._get_apr_for_score(credit_score) == expected_apr
+
+    def test_decision_table_matches_thresholds(self):
+        """Test the score decision table against the policy thresholds for every valid score."""
+        for credit_score in range(300, 851):
+            expected = (
+                2
+                if credit_score >= CreditPolicies.MIN_CREDIT_SCORE_AUTO_APPROVE
+                else 1 if credit_score >= CreditPolicies.MIN_CREDIT_SCORE_REVIEW else 0
             )
+            assert CreditPolicies._DECISION[credit_score - 300] == expected
 
+    def test_decision_for_unvalidated_scores_outside_table(self):
+        """Test that scores outside 300-850 get the decision their thresholds imply."""
+        for credit_score, approved in ((250, False), (-5, False), (900, True)):
             request = CreditRequest(
                 amount=Decimal("10000"),
                 term_months=24,
                 purpose="test",
                 actor_id="user_123",
-                profile=profile,
+                profile=CreditProfile.model_construct(credit_score=credit_score),
             )
 
             quote = CreditPolicies.evaluate_credit_request(request)
+            assert quote.approved is approved
+            assert quote.review_required is False
 
-            # For approved quotes, check APR
-            if quote.approved or quote.review_required:
-                assert (
-                    quote.apr == expected_apr
-                ), f"Credit score {credit_score} should get APR {expected_apr}, got {quote.apr}"
+    def test_repeated_evaluations_return_independent_quotes(self):
+        """Test that memoized evaluations hand each caller its own quote."""
+        request = CreditRequest(
+            amount=Decimal("15000"),
+            term_months=36,
+            purpose="test",
+            actor_id="user_123",
+            profile=CreditProfile(credit_score=780, annual_income=Decimal("85000")),
+        )
+
+        first = CreditPolicies.evaluate_credit_request(request)
+        second = CreditPolicies.evaluate_credit_request(request)
+
+        assert first == second
+        assert first.reasons is not second.reasons
+
+    def test_equal_amounts_keep_their_formatting(self):
+        """Test that reasons quote the amount as given, even when equal amounts were seen."""
+        for amount in ("500", "500.00"):
+            request = CreditRequest(
+                amount=Decimal(amount), term_months=12, purpose="test", actor_id="user_123"
+            )
+
+            quote = CreditPolicies.evaluate_credit_request(request)
+            assert f"${amount} below minimum" in quote.reasons[0]
 
     def test_list_policies(self):
         """Test listing policies."""
@@ -326,3 +404,26 @@ class TestCreditPolicies:
         for tier in rate_tiers:
             assert "min_score" in tier
             assert "apr" in tier
+
+    def test_list_policies_returns_independent_copies(self):
+        """Test that changing a returned listing does not leak into later calls."""
+        policies = CreditPolicies.list_policies()
+        policies["policy_version"] = "tampered"
+        policies["thresholds"]["max_dti_ratio"] = 1.0
+        policies["rate_tiers"].clear()
+
+        fresh = CreditPolicies.list_policies()
+        assert fresh["policy_version"] == CreditPolicies.POLICY_VERSION
+        assert fresh["thresholds"]["max_dti_ratio"] == float(CreditPolicies.MAX_DTI_RATIO)
+        assert len(fresh["rate_tiers"]) == len(CreditPolicies.RATE_TIERS)
+        assert json.loads(CreditPolicies.list_policies_json()) == fresh
+
+    def test_list_policies_json(self, monkeypatch):
+        """Test that the serialized listing matches list_policies and follows the version."""
+        policies = CreditPolicies.list_policies()
+        assert json.loads(CreditPolicies.list_policies_json()) == policies
+        assert json.loads(CreditPolicies.list_policies_json(indent=True)) == policies
+        assert b"\n  " in CreditPolicies.list_policies_json(indent=True)
+
+        monkeypatch.setattr(CreditPolicies, "POLICY_VERSION", "v9.9.9")
+        assert json.loads(CreditPolicies.list_policies_json())["policy_version"] == "v9.9.9"